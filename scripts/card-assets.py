@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Manage the card renderer's on-disk caches.
+
+Usage: python3 card-assets.py warm [--model NAME] [--cache-dir DIR] [--force]
+       python3 card-assets.py check-glow [--mode single|box] [--tolerance N]
+       python3 card-assets.py formats [--quality Q] [--compress-level C]
+       python3 card-assets.py compile [--plate-dir DIR]
+
+  warm        Run rembg once on the robot sprite and store the cut-out, so
+              renders never load the ONNX model. Run this at deploy time.
+  check-glow  Compare a collapsed glow blur mode against the original
+              stacked blurs for every glow style the renderers draw, and
+              fail if any pixel differs by more than the tolerance.
+  formats     Encode the demo cards in every output format and report the
+              mean file size and encode time, to pick a format per use.
+  compile     Build every static plate (background, robot, aura, gradient,
+              border) for every card design and store it as raw pixels,
+              so renderers memory-map it instead of decoding assets. Run
+              this at deploy time, after warm.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from card_render.assets import asset_path, clear_plates
+from card_render import glow, layout, plate_store, sprites
+from card_render.encode import FORMATS, Encoding, format_report
+from card_render.fonts import font
+from card_render.loader import load_script
+from card_render.specs import FULLART_V6, TIER_SPECS
+
+REMBG_SOURCES = ['robot-fullbody-front.webp']
+
+# (face, size, radius, passes, sample text) for every glow the renderers draw
+GLOW_STYLES = [
+    ('bold', 26, 10, 3, 'Bendr 2.0'),
+    ('bold', 15, 10, 3, 'OPENCLAW'),
+    ('bold', 24, 8, 3, 'Quigbot'),
+    ('bold', 24, 8, 2, 'SybilBot #47'),
+    ('bold', 14, 8, 2, 'OPENCLAW'),
+    ('bold', 14, 6, 2, 'CUSTOM'),
+    ('bold', 12, 6, 2, 'RISK'),
+    ('bold', 12, 6, 2, '98'),
+    ('bold', 11, 5, 2, 'VERIFIED'),
+    ('bold', 12, 4, 2, 'Identity Infra'),
+    ('regular', 11, 4, 1, 'Born from code and chaos.'),
+    ('regular', 10, 3, 1, 'HELIXA · ERC-8004 · BASE'),
+]
+
+
+def cmd_warm(args):
+    try:
+        results = sprites.warm([asset_path(n) for n in REMBG_SOURCES], model=args.model,
+                               cache_dir=args.cache_dir, force=args.force)
+    except ImportError:
+        print('❌ rembg is not installed; cannot warm the sprite cache')
+        return 1
+    for src, path, built in results:
+        state = 'built' if built else 'cached'
+        print(f'✅ {os.path.basename(src)} ({state}) → {path}')
+    return 0
+
+
+def cmd_check_glow(args):
+    failed = 0
+    for face, size, radius, passes, text in GLOW_STYLES:
+        worst, mean = glow.blur_error(text, font(face, size), (110, 236, 216, 200), radius, passes, args.mode)
+        ok = worst <= args.tolerance
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {text!r:28} {size:>2}px r={radius:<2} x{passes}: "
+              f'max {worst}/255, mean {mean:.3f}')
+    print(f'{args.mode}: {len(GLOW_STYLES) - failed}/{len(GLOW_STYLES)} styles within {args.tolerance}/255')
+    return 1 if failed else 0
+
+
+def cmd_formats(args):
+    tiers = load_script('render-card-tiers')
+    cards = [tiers.COMPOSERS[tier](data) for tier, data in tiers.DEMO_DATA.items()]
+    encodings = [Encoding(fmt, args.quality, args.compress_level) for fmt in FORMATS]
+    print(f'{len(cards)} demo cards, {cards[0].size[0]}x{cards[0].size[1]}')
+    for encoding, size, ms in format_report(cards, encodings):
+        print(f'{encoding.tag:<22} {size / 1024:8.1f} KiB {ms:8.1f} ms')
+    return 0
+
+
+def cmd_compile(args):
+    clear_plates()
+    with plate_store.compiling(args.plate_dir) as written:
+        for spec in [*TIER_SPECS.values(), FULLART_V6]:
+            layout.prebuild(spec)
+    total = 0
+    for path in written:
+        size = os.path.getsize(path)
+        total += size
+        print(f'✅ {os.path.basename(path)} ({size / 1024 / 1024:.1f} MiB)')
+    print(f'{len(written)} plates, {total / 1024 / 1024:.1f} MiB in {os.path.dirname(written[0]) if written else args.plate_dir}')
+    return 0 if written else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage Helixa card render caches')
+    sub = parser.add_subparsers(dest='command', required=True)
+    warm = sub.add_parser('warm', help='pre-compute rembg cut-outs')
+    warm.add_argument('--model', default=sprites.REMBG_MODEL)
+    warm.add_argument('--cache-dir', default=None)
+    warm.add_argument('--force', action='store_true', help='rebuild even if cached')
+    warm.set_defaults(func=cmd_warm)
+    check = sub.add_parser('check-glow', help='diff collapsed glow blurs against stacked blurs')
+    check.add_argument('--mode', choices=[m for m in glow.BLUR_MODES if m != 'stacked'], default='single')
+    check.add_argument('--tolerance', type=int, default=4, help='max allowed per-channel difference (0-255)')
+    check.set_defaults(func=cmd_check_glow)
+    formats = sub.add_parser('formats', help='compare output formats on the demo cards')
+    formats.add_argument('--quality', type=int, default=None)
+    formats.add_argument('--compress-level', type=int, default=None)
+    formats.set_defaults(func=cmd_formats)
+    compile_ = sub.add_parser('compile', help='store every plate as raw pixels for memory-mapping')
+    compile_.add_argument('--plate-dir', default=plate_store.PLATE_DIR)
+    compile_.set_defaults(func=cmd_compile)
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
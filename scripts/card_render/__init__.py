@@ -0,0 +1,6 @@
+"""
+Shared helpers for the Pillow card renderers in scripts/.
+
+render-card-tiers.py and render-fullart.py import from here so that
+expensive per-card work only has to be optimized once.
+"""
@@ -0,0 +1,127 @@
+"""
+Agent records streamed from the indexer's SQLite database.
+
+api/indexer.js keeps every agent in the ``agents`` table of
+data/agents.db (WAL mode). AgentSource reads it directly, so a batch
+render needs no hand export:
+
+  - the database is opened read-only (``mode=ro``), and rows are read in
+    short pages ordered by (lastUpdated, tokenId), one read transaction
+    per page, so the indexer keeps writing and checkpointing while a long
+    batch renders;
+  - only rows changed since the watermark are read; rows the indexer
+    updates mid-run land past the snapshot taken at the start and are
+    picked up by the next run;
+  - ``verified`` / ``soulbound`` become the VERIFIED / SOULBOUND badges
+    and ``credScore`` becomes cred, which picks the tier.
+
+The watermark (a small JSON file, by default next to the outputs) is the
+(lastUpdated, tokenId) of the last row handled. commit() moves it up to
+just before the first agent that failed to render, so failures are
+retried on the next run and nothing after them is skipped.
+"""
+import json
+import os
+import sqlite3
+
+from .manifest import normalize
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'agents.db')
+WATERMARK_NAME = '.agents-watermark.json'
+PAGE_SIZE = 500
+
+# Flag column -> badge, in the order render-fullart.py draws them
+BADGE_COLUMNS = (('soulbound', 'SOULBOUND'), ('verified', 'VERIFIED'))
+
+_UPDATED = 'COALESCE(lastUpdated, 0)'
+_PAGE = (f'SELECT tokenId, name, framework, verified, soulbound, credScore, {_UPDATED} AS updated '
+         f'FROM agents WHERE ({_UPDATED} > ? OR ({_UPDATED} = ? AND tokenId > ?)) AND {_UPDATED} <= ? '
+         f'ORDER BY {_UPDATED}, tokenId LIMIT ?')
+
+
+def connect(path):
+    """Read-only connection; fails if ``path`` doesn't exist rather than creating it."""
+    uri = 'file:' + os.path.abspath(path).replace('?', '%3f').replace('#', '%23') + '?mode=ro'
+    db = sqlite3.connect(uri, uri=True)
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def row_record(row):
+    """Raw manifest-style dict for an ``agents`` row (see card_render.manifest)."""
+    return {
+        'id': row['tokenId'],
+        'name': row['name'],
+        'framework': row['framework'],
+        'cred': row['credScore'],
+        'badges': [badge for column, badge in BADGE_COLUMNS if row[column]],
+    }
+
+
+def _load(path):
+    try:
+        with open(path) as f:
+            mark = json.load(f)
+        return mark['lastUpdated'], mark['tokenId']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+class AgentSource:
+    """Agents changed since the watermark, oldest change first."""
+
+    def __init__(self, db_path=DEFAULT_DB, watermark_path=None, full=False, page_size=PAGE_SIZE):
+        self.db_path = db_path
+        self.watermark_path = watermark_path
+        self.page_size = page_size
+        saved = None if full or watermark_path is None else _load(watermark_path)
+        self.start = saved or (-1, -1)
+        self.last = self.start
+        self._seen = []
+
+    def rows(self):
+        """Stream ``agents`` rows after the watermark, up to the newest at call time."""
+        db = connect(self.db_path)
+        try:
+            until = db.execute(f'SELECT COALESCE(MAX({_UPDATED}), -1) FROM agents').fetchone()[0]
+            updated, token = self.start
+            while True:
+                page = db.execute(_PAGE, (updated, updated, token, until, self.page_size)).fetchall()
+                if not page:
+                    return
+                for row in page:
+                    yield row
+                updated, token = page[-1]['updated'], page[-1]['tokenId']
+        finally:
+            db.close()
+
+    def records(self, errors=None):
+        """Normalized records. Bad rows go to ``errors`` if given, else raise."""
+        for row in self.rows():
+            position = (row['updated'], row['tokenId'])
+            try:
+                record = normalize(row_record(row), row['tokenId'])
+            except (ValueError, TypeError) as e:
+                if errors is None:
+                    raise
+                errors.append(str(e))
+                self._seen.append((position, None))
+                continue
+            self._seen.append((position, record['id']))
+            yield record
+
+    def commit(self, failed_ids=()):
+        """Advance the watermark past every handled row before the first failure; returns it."""
+        failed = set(failed_ids)
+        for position, agent_id in self._seen:
+            if agent_id is not None and agent_id in failed:
+                break
+            self.last = position
+        self._seen = []
+        if self.watermark_path is not None and self.last != self.start:
+            tmp = f'{self.watermark_path}.{os.getpid()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'lastUpdated': self.last[0], 'tokenId': self.last[1]}, f)
+            os.replace(tmp, self.watermark_path)
+        self.start = self.last
+        return self.last
@@ -0,0 +1,75 @@
+"""
+Process-wide cache of precomposed static card layers ("plates").
+
+Everything a renderer draws before the agent-specific layers (background,
+robot, default aura, gradient, border) is identical for every card of a
+tier. Renderers build that once via get_plate() and start each card from
+``plate.copy()``. Plates are keyed on the content hash of every asset they
+read plus the layout constants used to build them, so editing an asset or
+a constant invalidates the cached plate automatically. A plate compiled
+ahead of time (card_render.plate_store) is memory-mapped instead of built.
+"""
+import hashlib
+import os
+import threading
+
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assets')
+
+_digests = {}
+_plates = {}
+_lock = threading.RLock()
+
+
+def asset_path(name):
+    return os.path.join(ASSETS, name)
+
+
+def file_digest(path):
+    """SHA-256 of a file, memoized on (path, mtime, size). None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _digests.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _digests[path] = (stamp, digest)
+    return digest
+
+
+def plate_key(name, assets, layout):
+    return (name, tuple((os.path.basename(p), file_digest(p)) for p in assets), tuple(layout))
+
+
+def get_plate(name, assets, layout, build):
+    """Return the cached result of ``build()`` for this plate.
+
+    ``assets`` is the list of files the builder reads and ``layout`` the
+    constants it uses. The returned object is shared: treat images as
+    read-only and ``.copy()`` them before drawing.
+    """
+    key = plate_key(name, assets, layout)
+    plate = _plates.get(key)
+    if plate is None:
+        with _lock:
+            plate = _plates.get(key)
+            if plate is None:
+                # Drop stale builds of the same plate (asset or layout changed)
+                for stale in [k for k in _plates if k[0] == name]:
+                    del _plates[stale]
+                # Imported here: plate_store -> sprites -> this module
+                from . import plate_store
+                plate = plate_store.fetch(key, build)
+                _plates[key] = plate
+    return plate
+
+
+def clear_plates():
+    _plates.clear()
+    _digests.clear()
@@ -0,0 +1,131 @@
+"""
+Decoded, resized aura sprites, shared across cards and processes.
+
+An agent's aura used to be opened, decoded and resized (through every
+size in the spec's chain, e.g. 130px then 200px for Basic) on each card.
+aura_sprite() memoizes the final RGBA sprite, keyed on the file's
+content hash, the size chain and the resample filter:
+
+  memory  LRU bounded by HELIXA_AURA_CACHE_MB (default 64)
+  disk    raw pixels under <cache>/auras (HELIXA_AURA_DIR), written in
+          the card_render.plate_store format and memory-mapped on load,
+          so other workers and later runs skip the decode too. Bounded
+          by HELIXA_AURA_STORE_MB (default 256): a disk hit refreshes
+          the file's mtime, and each write drops the least recently
+          used files over the limit
+
+Renaming or copying an aura file keeps its cache entries; editing it
+changes the hash. Sprites are shared: treat them as read-only.
+
+prefetch() wraps the stream of records a batch still has to render (see
+batch.pending(), after the output cache check): it decodes upcoming
+agents' auras on a thread pool (Pillow releases the GIL while decoding
+and resizing) so they are cached before each card is composited.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from . import plate_store
+from .assets import file_digest
+from .lru import LRUCache, image_bytes
+from .quality import render_quality
+from .sprites import CACHE_DIR
+
+AURA_DIR = os.environ.get('HELIXA_AURA_DIR') or os.path.join(CACHE_DIR, 'auras')
+_CACHE_BYTES = int(float(os.environ.get('HELIXA_AURA_CACHE_MB', 64)) * 1024 * 1024)
+sprites = LRUCache(_CACHE_BYTES, image_bytes)
+STORE_BYTES = int(float(os.environ.get('HELIXA_AURA_STORE_MB', 256)) * 1024 * 1024)
+
+
+def _decode(path, sizes, resample):
+    aura = Image.open(path).convert('RGBA')
+    for size in sizes:
+        aura = aura.resize((size, size), resample)
+    return aura
+
+
+def prune(store_dir=None, max_bytes=None):
+    """Delete the least recently used sprite files until the store holds at most ``max_bytes``."""
+    store_dir = store_dir or AURA_DIR
+    max_bytes = STORE_BYTES if max_bytes is None else max_bytes
+    files = []
+    try:
+        for entry in os.scandir(store_dir):
+            if entry.name.endswith('.plate'):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # already pruned by another worker
+        total -= size
+
+
+def _touch(key):
+    try:
+        os.utime(plate_store.plate_file(key, AURA_DIR))
+    except OSError:
+        pass
+
+
+def aura_sprite(path, sizes, resample):
+    """The aura at ``path`` resized through each of ``sizes`` in turn with ``resample``."""
+    digest = file_digest(path)
+    if digest is None:
+        raise FileNotFoundError(path)
+    chain = 'x'.join(str(size) for size in sizes)
+    key = (f'aura-{digest[:32]}-{chain}-{int(resample)}', digest, tuple(sizes), int(resample))
+    sprite = sprites.get(key)
+    if sprite is None:
+        sprite = plate_store.load(key, AURA_DIR)
+        if sprite is not None:
+            _touch(key)
+        else:
+            sprite = _decode(path, sizes, resample)
+            try:
+                plate_store.save(key, sprite, AURA_DIR)
+                prune()
+            except OSError:
+                pass  # read-only cache dir: memory only
+        sprites.put(key, sprite)
+    return sprite
+
+
+def _preload(jobs):
+    for job in jobs:
+        aura_sprite(*job)
+
+
+def prefetch(records, jobs_for, quality='final', ahead=32, workers=4):
+    """Yield ``records`` in order, preloading auras ``ahead`` records in advance.
+
+    ``jobs_for(record)`` lists the ``(path, sizes, resample)`` sprites a
+    record will need when rendered at ``quality``. Preload errors are
+    ignored here; the render reports them.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for record in records:
+            with render_quality(quality):
+                jobs = jobs_for(record)
+            window.append((record, pool.submit(_preload, jobs) if jobs else None))
+            if len(window) > ahead:
+                yield _ready(window.popleft())
+        while window:
+            yield _ready(window.popleft())
+
+
+def _ready(item):
+    record, future = item
+    if future is not None:
+        future.exception()
+    return record
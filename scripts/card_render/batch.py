@@ -0,0 +1,107 @@
+"""
+Render many cards in one process.
+
+run_batch() drives any ``render_one(record, out_path)`` callable over a
+stream of manifest records, so interpreter start-up, Pillow import, rembg
+and the static plates are paid once per batch instead of once per card.
+With an OutputCache, agents whose card hasn't changed are skipped.
+"""
+import os
+import re
+import time
+from collections import deque
+
+from .sizes import size_label, sized_path
+
+
+def output_path(output_dir, record, ext='png'):
+    safe_id = re.sub(r'[^\w.-]', '_', record['id'])
+    return os.path.join(output_dir, f'{safe_id}.{ext}')
+
+
+class BatchStats:
+    def __init__(self):
+        self.rendered = 0
+        self.skipped = 0
+        self.failed = []
+        self.stages = None
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.rendered / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f'{self.rendered} cards in {self.elapsed:.1f}s ({self.rate:.2f} cards/s), '
+                f'{self.skipped} unchanged, {len(self.failed)} failed')
+
+
+def pending(records, output_dir, stats, cache=None, encoding=None, sizes=None, preload=None):
+    """Yield (record, out_path, all_out_paths, key) for records that actually need rendering.
+
+    ``out_path`` is what render_one is given; with several ``sizes`` it
+    writes each of ``all_out_paths`` (see card_render.sizes).
+    ``preload(records)`` wraps the stream of records left to render and
+    must yield the same records in order (e.g. card_render.auras.prefetch).
+    """
+    ext = encoding.ext if encoding else 'png'
+    variant = encoding.tag if encoding else 'png'
+    if sizes and sizes != [None]:
+        variant += ''.join(size_label(s) or '@full' for s in sizes)
+    paths = deque()
+
+    def needed():
+        for record in records:
+            out = output_path(output_dir, record, ext)
+            outs = [sized_path(out, s) for s in sizes] if sizes else [out]
+            key = None
+            if cache is not None:
+                key = cache.key(record, variant)
+                if cache.restore(record['id'], key, outs):
+                    stats.skipped += 1
+                    continue
+                # Outputs may be hard links into the store; never write through one
+                for path in outs:
+                    if os.path.lexists(path):
+                        os.unlink(path)
+            paths.append((out, outs, key))
+            yield record
+
+    for record in (needed() if preload is None else preload(needed())):
+        yield (record, *paths.popleft())
+
+
+def finish(stats, record, outs, key, error, cache=None):
+    """Count a rendered (or failed) card; failing to store it in ``cache`` fails it too."""
+    if error is None and cache is not None:
+        try:
+            cache.store(record['id'], key, outs)
+        except OSError as e:
+            error = f'output cache: {e}'
+    if error is not None:
+        stats.failed.append((record['id'], error))
+        print(f"❌ {record['id']}: {error}")
+        return
+    stats.rendered += 1
+
+
+def run_batch(records, render_one, output_dir, cache=None, encoding=None, sizes=None, preload=None):
+    """Render every record; a failing record is logged and skipped."""
+    os.makedirs(output_dir, exist_ok=True)
+    stats = BatchStats()
+    try:
+        for record, out, outs, key in pending(records, output_dir, stats, cache, encoding, sizes, preload):
+            try:
+                render_one(record, out)
+            except Exception as e:
+                finish(stats, record, outs, key, str(e), cache)
+                continue
+            finish(stats, record, outs, key, None, cache)
+    finally:
+        if cache is not None:
+            cache.save()
+    return stats
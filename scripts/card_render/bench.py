@@ -0,0 +1,216 @@
+"""
+Render benchmark over a fixed synthetic corpus.
+
+synthetic_corpus() builds the same agents for a given seed every time:
+names, bios and trait lists of varying length across all three tiers,
+with every fifth agent bringing its own aura. bench_renderer() renders
+the corpus in-process, encodes every card in memory and reports
+cards/s, latency percentiles, peak RSS and the mean time per card spent
+in each layer (see card_render.trace). On Linux it also reports each
+card's own peak: the process high-water mark is reset before the card
+(/proc/self/clear_refs) and compared with the RSS it started from. glibc
+reuses freed heap for large buffers once it has seen them, so run with
+MALLOC_MMAP_THRESHOLD_=65536 to make that peak follow the live buffers. Plate building (or mapping,
+with compiled plates) is timed separately as the cold start.
+bench_updates() times re-rendering each agent after a cred change, from
+scratch and through the incremental layer cache (card_render.incremental).
+
+Results are plain dicts so they can be dumped as JSON and later passed
+back to regressions() as a baseline.
+"""
+import glob
+import os
+import platform
+import random
+import time
+
+import PIL
+
+from . import glow, layout, plate_store, trace
+from .assets import asset_path, clear_plates
+from .encode import encode
+from .incremental import LayerCache
+from .manifest import TIERS, normalize
+from .stats import percentile
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+CUSTOM_AURA = asset_path('aura-v2-test.webp')
+CRED_RANGES = {'basic': (0, 25), 'holo': (26, 60), 'fullart': (61, 100)}
+
+_NAMES = ['Bendr', 'Quigbot', 'SybilBot', 'Atlas', 'Nyx', 'Helios', 'Cipher', 'Orion', 'Vega', 'Moth']
+_SUFFIXES = ['', ' 2.0', ' #47', ' Prime', ' of the Eastern Relay', ' v3']
+_FRAMEWORKS = ['OPENCLAW', 'ELIZA', 'CUSTOM', 'AGENTKIT', 'VIRTUALS', 'LANGCHAIN']
+_BADGES = ['VERIFIED', 'SOULBOUND']
+_TRAITS = ['Builder', 'Identity Infra', 'Base Native', 'V1 OG', 'Strategist', 'Analytical',
+           'Chaotic Good', 'Snarky', 'Researcher', 'Market Maker']
+_WORDS = ('born from code and chaos builds onchain identity infrastructure for ai agents one smart '
+          'contract at a time product visionary shipping the future of agent reputation across '
+          'chains with verifiable credentials and a taste for clean abstractions').split()
+
+
+def synthetic_corpus(per_tier=20, seed=8004):
+    """``per_tier`` normalized agent records for each tier, deterministic for ``seed``."""
+    rng = random.Random(seed)
+    records = []
+    for tier in TIERS:
+        lo, hi = CRED_RANGES[tier]
+        for i in range(per_tier):
+            raw = {
+                'id': f'bench-{tier}-{i}',
+                'name': rng.choice(_NAMES) + rng.choice(_SUFFIXES),
+                'framework': rng.choice(_FRAMEWORKS),
+                'cred': rng.randint(lo, hi),
+                'risk': rng.randint(0, 100),
+                'auto': rng.randint(0, 100),
+                'badges': rng.sample(_BADGES, rng.randint(0, len(_BADGES))),
+                'traits': rng.sample(_TRAITS, rng.randint(0, 5)),
+                'bio': ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(4, 40))).capitalize() + '.',
+                'aura': CUSTOM_AURA if i % 5 == 4 else None,
+            }
+            records.append(normalize(raw, i))
+    return records
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if platform.system() == 'Darwin' else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def _proc_kib(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return None
+
+
+def reset_peak_rss():
+    """Start a new high-water mark at the current RSS; returns that RSS in KiB, or None if unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _proc_kib('VmRSS')
+    except OSError:
+        return None
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def _latency(values):
+    values = sorted(values)
+    return {
+        'p50': _ms(percentile(values, 50)),
+        'p95': _ms(percentile(values, 95)),
+        'max': _ms(values[-1]),
+        'mean': _ms(sum(values) / len(values)),
+    }
+
+
+def _layers(times, cards):
+    return {name: _ms(total / cards) for name, total in sorted(times.totals.items(), key=lambda kv: -kv[1])}
+
+
+def cold_start(warm):
+    """Time building every plate from scratch: {'ms': total, 'layers_ms': {...}}."""
+    clear_plates()
+    glow.clear_caches()
+    started = time.perf_counter()
+    with trace.recording() as times:
+        for fn in warm:
+            fn()
+    return {'ms': _ms(time.perf_counter() - started), 'layers_ms': _layers(times, 1)}
+
+
+def bench_renderer(records, compose, encoding=None, warmup=3):
+    """Render and encode every record with ``compose(record)``; returns the stats dict."""
+    for record in records[:warmup]:
+        encode(compose(record), encoding)
+    latencies = []
+    by_tier = {}
+    card_peaks = []
+    peak = peak_rss_mb()  # resetting the high-water mark below also resets ru_maxrss
+    times = trace.LayerTimes()
+    started = time.perf_counter()
+    for record in records:
+        rss = reset_peak_rss()
+        t0 = time.perf_counter()
+        with trace.recording(times):
+            with trace.span('other'):
+                card = compose(record)
+            encode(card, encoding)
+        elapsed = time.perf_counter() - t0
+        if rss is not None:
+            high = _proc_kib('VmHWM')
+            card_peaks.append((high - rss) / 1024)
+            peak = max(peak, round(high / 1024, 1))
+        latencies.append(elapsed)
+        by_tier.setdefault(record['tier'], []).append(elapsed)
+    total = time.perf_counter() - started
+    return {
+        'cards': len(records),
+        'seconds': round(total, 3),
+        'cards_per_s': round(len(records) / total, 2),
+        'latency_ms': _latency(latencies),
+        'by_tier': {tier: _latency(values) for tier, values in by_tier.items()},
+        'layers_ms': _layers(times, len(records)),
+        'peak_rss_mb': max(peak, peak_rss_mb()) if peak is not None else None,
+        'card_peak_mb': _card_peaks(card_peaks),
+    }
+
+
+def _card_peaks(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {'p50': round(percentile(values, 50), 2), 'max': round(values[-1], 2)}
+
+
+def bench_updates(records, spec_for, field='cred'):
+    """Compose time (no encode) for each record after bumping ``field``: full vs incremental."""
+    cache = LayerCache()
+    full, incremental = [], []
+    for record in records:
+        spec = spec_for(record)
+        cache.compose(spec, record)
+        updated = dict(record, **{field: (record[field] + 1) % 101})
+        layout.compose(spec, updated)  # both timings see the same warm glow caches
+        t0 = time.perf_counter()
+        layout.compose(spec, updated)
+        full.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        cache.compose(spec, updated)
+        incremental.append(time.perf_counter() - t0)
+    return {'field': field, 'full_ms': _latency(full), 'incremental_ms': _latency(incremental)}
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'platform': platform.platform(),
+        'blur': glow.BLUR_MODE,
+        'compiled_plates': len(glob.glob(os.path.join(plate_store.PLATE_DIR, '*.plate'))),
+    }
+
+
+def regressions(result, baseline, threshold):
+    """Messages for every renderer whose cards/s fell more than ``threshold`` (0.1 = 10%)."""
+    found = []
+    for name, current in result['renderers'].items():
+        before = baseline.get('renderers', {}).get(name)
+        if not before or not before.get('cards_per_s'):
+            continue
+        change = current['cards_per_s'] / before['cards_per_s'] - 1
+        if change < -threshold:
+            found.append(f"{name}: {current['cards_per_s']} cards/s vs {before['cards_per_s']} "
+                         f"in baseline ({change:+.1%}, limit -{threshold:.0%})")
+    return found
@@ -0,0 +1,67 @@
+"""
+Inner-edge fade for the ornate full art border.
+
+The border asset is opaque all the way into the card, so both renderers
+fade its alpha out between FADE_START and FADE_END px from the nearest
+edge and clear everything further in. Instead of walking every pixel in
+Python, the card is split into one-pixel rectangular rings (every pixel
+on a ring has the same distance to the edge) and each ring gets a 256
+entry alpha lookup table applied with Image.point.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+FADE_START = 43
+FADE_END = 55
+FADE_SPAN = FADE_END - FADE_START
+
+
+def tiers_falloff(alpha, dist):
+    """Fade used by render-card-tiers.py (integer ratio)."""
+    return int(alpha * (FADE_END - dist) / FADE_SPAN)
+
+
+def fullart_falloff(alpha, dist):
+    """Fade used by render-fullart.py (float ratio, rounds differently)."""
+    return int(alpha * (1.0 - (dist - FADE_START) / FADE_SPAN))
+
+
+@lru_cache(maxsize=None)
+def _ring_masks(size):
+    """One mask per fade distance, each covering exactly that ring."""
+    w, h = size
+    rings = []
+    for dist in range(FADE_START + 1, FADE_END):
+        if w - 1 - dist < dist or h - 1 - dist < dist:
+            break
+        mask = Image.new('L', size, 0)
+        ImageDraw.Draw(mask).rectangle([dist, dist, w - 1 - dist, h - 1 - dist], outline=255)
+        rings.append((dist, mask))
+    return tuple(rings)
+
+
+@lru_cache(maxsize=None)
+def _ring_luts(falloff):
+    return tuple(
+        (dist, [falloff(a, dist) for a in range(256)])
+        for dist in range(FADE_START + 1, FADE_END)
+    )
+
+
+def fade_inner_edge(border, falloff=tiers_falloff):
+    """Return a copy of an RGBA border with its inner edge faded out.
+
+    Pixels closer than FADE_START keep their alpha, pixels in the fade
+    zone get ``falloff(alpha, dist)`` and pixels at FADE_END or beyond
+    become fully transparent. RGB is left untouched.
+    """
+    w, h = border.size
+    r, g, b, a = border.split()
+    faded = a.copy()
+    luts = dict(_ring_luts(falloff))
+    for dist, mask in _ring_masks(border.size):
+        faded.paste(a.point(luts[dist]), (0, 0), mask)
+    if w > 2 * FADE_END and h > 2 * FADE_END:
+        faded.paste(0, (FADE_END, FADE_END, w - FADE_END, h - FADE_END))
+    return Image.merge('RGBA', (r, g, b, faded))
@@ -0,0 +1,122 @@
+"""
+Encode composited cards to files or bytes.
+
+  png            lossless, zlib --compress-level 0-9 (Pillow default 6)
+  webp           lossy WebP, --quality 0-100 (default 90)
+  webp-lossless  lossless WebP, --quality is encoder effort 0-100
+  jpeg           lossy, --quality 0-100 (default 90), alpha flattened
+
+For WebP, --compress-level is the encoder method 0-6 (speed vs size).
+"""
+import time
+from io import BytesIO
+
+from .trace import traced
+
+# name -> (Pillow format, extension, MIME type, default quality)
+FORMATS = {
+    'png': ('PNG', 'png', 'image/png', None),
+    'webp': ('WEBP', 'webp', 'image/webp', 90),
+    'webp-lossless': ('WEBP', 'webp', 'image/webp', 80),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', 90),
+}
+
+DEFAULT_WEBP_METHOD = 4
+
+
+class Encoding:
+    """Output format plus its quality / compression knobs."""
+
+    def __init__(self, fmt='png', quality=None, compress_level=None):
+        if fmt not in FORMATS:
+            raise ValueError(f'unknown format {fmt!r}, expected one of {", ".join(FORMATS)}')
+        self.fmt = fmt
+        self.quality = quality if quality is not None else FORMATS[fmt][3]
+        self.compress_level = compress_level
+
+    @property
+    def ext(self):
+        return FORMATS[self.fmt][1]
+
+    @property
+    def mime_type(self):
+        return FORMATS[self.fmt][2]
+
+    @property
+    def tag(self):
+        """Stable label for cache keys and reports, e.g. ``webp-q90-m4``."""
+        _, options = self.save_args()
+        parts = [self.fmt]
+        if 'quality' in options:
+            parts.append(f"q{options['quality']}")
+        if 'method' in options:
+            parts.append(f"m{options['method']}")
+        if 'compress_level' in options:
+            parts.append(f"z{options['compress_level']}")
+        return '-'.join(parts)
+
+    def save_args(self):
+        pil_format = FORMATS[self.fmt][0]
+        options = {}
+        if self.fmt == 'png':
+            if self.compress_level is not None:
+                options['compress_level'] = self.compress_level
+        elif self.fmt.startswith('webp'):
+            options['quality'] = self.quality
+            options['method'] = DEFAULT_WEBP_METHOD if self.compress_level is None else self.compress_level
+            if self.fmt == 'webp-lossless':
+                options['lossless'] = True
+        else:
+            options['quality'] = self.quality
+        return pil_format, options
+
+    def __repr__(self):
+        return f'Encoding({self.tag})'
+
+
+PNG = Encoding('png')
+
+
+def _prepare(card, encoding):
+    if encoding.fmt == 'jpeg' and card.mode != 'RGB':
+        return card.convert('RGB')
+    return card
+
+
+@traced('encode')
+def save(card, fp, encoding=None):
+    """Save a card to a path or file object."""
+    encoding = encoding or PNG
+    pil_format, options = encoding.save_args()
+    _prepare(card, encoding).save(fp, pil_format, **options)
+
+
+def encode(card, encoding=None):
+    """Encode a card to bytes."""
+    buf = BytesIO()
+    save(card, buf, encoding)
+    return buf.getvalue()
+
+
+def format_report(cards, encodings):
+    """[(encoding, mean bytes, mean encode ms)] for each encoding over ``cards``."""
+    rows = []
+    for encoding in encodings:
+        total_bytes = 0
+        started = time.perf_counter()
+        for card in cards:
+            total_bytes += len(encode(card, encoding))
+        ms = (time.perf_counter() - started) * 1000
+        rows.append((encoding, total_bytes / len(cards), ms / len(cards)))
+    return rows
+
+
+def add_arguments(parser):
+    """Add --format / --quality / --compress-level to a CLI parser."""
+    parser.add_argument('--format', choices=list(FORMATS), default='png', help='output encoding')
+    parser.add_argument('--quality', type=int, default=None, help='webp/jpeg quality, lossless webp effort (0-100)')
+    parser.add_argument('--compress-level', type=int, default=None, help='png zlib level (0-9) or webp method (0-6)')
+
+
+def from_args(args):
+    return Encoding(args.format, args.quality, args.compress_level)
@@ -0,0 +1,42 @@
+"""
+Shared typography registry.
+
+Font files are resolved once per face and FreeTypeFont objects are cached
+per (face, size), so drawing a stat bar or badge never touches the
+filesystem or FreeType loading again. Both renderers get their fonts here.
+"""
+import os
+from functools import lru_cache
+
+from PIL import ImageFont
+
+DEJAVU = '/usr/share/fonts/truetype/dejavu'
+
+# Candidate files per face, first existing wins
+FACES = {
+    'bold': [os.path.join(DEJAVU, 'DejaVuSans-Bold.ttf')],
+    'regular': [os.path.join(DEJAVU, 'DejaVuSans.ttf'), os.path.join(DEJAVU, 'DejaVuSans-Bold.ttf')],
+}
+
+
+@lru_cache(maxsize=None)
+def font_path(face):
+    """Path of the first installed file for ``face``, or None."""
+    for path in FACES[face]:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def font(face, size):
+    """Cached FreeTypeFont for ``face`` at ``size`` (Pillow default if missing)."""
+    path = font_path(face)
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+def clear_fonts():
+    font_path.cache_clear()
+    font.cache_clear()
@@ -0,0 +1,243 @@
+"""
+Glyph-sized glow rendering.
+
+A glow used to be drawn on a transparent layer the size of the whole card
+and blurred there, even though only a few hundred pixels around the text
+carry any ink. Here the glow is drawn on a patch covering just the ink
+bounding box, padded by how far the stacked blurs can spread it, and then
+composited back at the patch origin.
+
+Outside the ink, the transparent full-card layer is zero all the way to the
+padding. So blurring the patch gives exactly the pixels that the full-card
+blur gave inside it. Where the patch touches the card edge, Pillow clamps
+the same way it does for the full card. For a given blur mode the patch
+is therefore pixel-identical to the full-card glow; matching the legacy
+renderers exactly also needs HELIXA_GLOW_BLUR=stacked (see below).
+
+Labels, stat values, badges and the footer repeat on every card, so glow
+patches and crisp text masks are also memoized in byte-bounded LRU caches
+(HELIXA_GLOW_CACHE_MB, default 64). An unclipped glow patch is the same
+wherever it lands, so a cache hit is just an alpha paste. Patches that
+would be clipped by the card edge are always rendered fresh.
+
+Stacked blurs are collapsed: ``passes`` GaussianBlur(r) calls equal one
+Gaussian with sigma sqrt(passes) * r, so a triple-pass glow costs one
+filter. HELIXA_GLOW_BLUR selects the mode:
+
+  single   one equivalent Gaussian (default, within 3/255 of stacked)
+  stacked  the original repeated blurs, for exact legacy output
+  box      one box blur of matching variance (fast, visibly blockier)
+
+Draft renders (see card_render.quality) always use box.
+
+``python3 scripts/card-assets.py check-glow`` measures the per-pixel error
+of a mode against stacked blurs for every glow style the renderers use.
+"""
+import math
+import os
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from . import quality
+from .lru import LRUCache, image_bytes
+
+# Extra padding in case glyph ink pokes slightly outside textbbox
+INK_SLACK = 2
+
+BLUR_MODES = ('single', 'stacked', 'box')
+BLUR_MODE = os.environ.get('HELIXA_GLOW_BLUR', 'single')
+if BLUR_MODE not in BLUR_MODES:
+    raise ValueError(f'HELIXA_GLOW_BLUR must be one of {BLUR_MODES}, got {BLUR_MODE!r}')
+
+_CACHE_BYTES = int(float(os.environ.get('HELIXA_GLOW_CACHE_MB', 64)) * 1024 * 1024)
+glow_sprites = LRUCache(_CACHE_BYTES, lambda sprite: image_bytes(sprite[0]))
+text_masks = LRUCache(_CACHE_BYTES // 4, lambda sprite: image_bytes(sprite[0]))
+
+
+def default_mode():
+    """Blur mode for the current render: box for drafts, else BLUR_MODE."""
+    return quality.DRAFT_BLUR if quality.is_draft() else BLUR_MODE
+
+
+def equivalent_sigma(radius, passes):
+    """Sigma of the single Gaussian equal to ``passes`` blurs of ``radius``."""
+    return radius * math.sqrt(passes)
+
+
+def box_radius(radius, passes):
+    """BoxBlur radius with the same variance as the stacked Gaussians."""
+    sigma = equivalent_sigma(radius, passes)
+    return (math.sqrt(12 * sigma * sigma + 1) - 1) / 2
+
+
+def blur(img, radius, passes, mode=None):
+    """Apply ``passes`` GaussianBlur(radius) calls the way ``mode`` says."""
+    mode = mode or default_mode()
+    if passes <= 0:
+        return img
+    if mode == 'box':
+        return img.filter(ImageFilter.BoxBlur(box_radius(radius, passes)))
+    if mode == 'stacked' or passes == 1:
+        for _ in range(passes):
+            img = img.filter(ImageFilter.GaussianBlur(radius))
+        return img
+    return img.filter(ImageFilter.GaussianBlur(equivalent_sigma(radius, passes)))
+
+
+def blur_margin(radius, passes, mode=None):
+    """Upper bound on how far ``blur(img, radius, passes, mode)`` spreads ink.
+
+    Pillow approximates a Gaussian with three box blurs of roughly
+    ``radius``, each reaching at most ceil(radius) + 1 pixels.
+    """
+    mode = mode or default_mode()
+    if passes <= 0:
+        return 0
+    if mode == 'box':
+        return math.ceil(box_radius(radius, passes)) + 1
+    if mode == 'stacked' or passes == 1:
+        return passes * (3 * math.ceil(radius) + 3)
+    return 3 * math.ceil(equivalent_sigma(radius, passes)) + 3
+
+
+def patch_box(canvas_size, bbox, margin):
+    """Pad ``bbox`` by ``margin`` and clip to the canvas. None if empty."""
+    w, h = canvas_size
+    left = max(0, math.floor(bbox[0]) - margin)
+    top = max(0, math.floor(bbox[1]) - margin)
+    right = min(w, math.ceil(bbox[2]) + margin)
+    bottom = min(h, math.ceil(bbox[3]) + margin)
+    if right <= left or bottom <= top:
+        return None
+    return left, top, right, bottom
+
+
+def paint_patch(canvas_size, bbox, paint, radius=0, passes=0, mode=None):
+    """Draw (and optionally blur) a layer on a tight patch instead of the canvas.
+
+    ``bbox`` bounds the ink ``paint(draw, ox, oy)`` will produce; paint
+    draws in patch coordinates, i.e. shifted by (-ox, -oy). The patch is
+    padded for ``passes`` GaussianBlur(radius) calls, which are then
+    applied (see blur()). Returns ``(patch, (ox, oy))``, or ``(None, None)`` when there
+    is nothing to draw.
+    """
+    if bbox is None or bbox[2] <= bbox[0] or bbox[3] <= bbox[1]:
+        return None, None
+    margin = blur_margin(radius, passes, mode) + INK_SLACK if passes else 0
+    box = patch_box(canvas_size, bbox, margin)
+    if box is None:
+        return None, None
+    ox, oy = box[0], box[1]
+    patch = Image.new('RGBA', (box[2] - ox, box[3] - oy), (0, 0, 0, 0))
+    paint(ImageDraw.Draw(patch), ox, oy)
+    return blur(patch, radius, passes, mode), (ox, oy)
+
+
+def text_bbox(canvas, xy, text, font):
+    return ImageDraw.Draw(canvas).textbbox(xy, text, font=font)
+
+
+def _font_key(font):
+    path = getattr(font, 'path', None)
+    if path is None:
+        return None
+    return path, font.size, getattr(font, 'index', 0)
+
+
+def _sprite_key(xy, text, font, *style):
+    """Cache key, or None when the text can't be drawn from a cached sprite."""
+    font_key = _font_key(font)
+    if font_key is None or '\n' in text or not all(isinstance(v, int) for v in xy):
+        return None
+    return (text, font_key) + style
+
+
+def _inside(canvas_size, origin, size):
+    return (origin[0] >= 0 and origin[1] >= 0 and
+            origin[0] + size[0] <= canvas_size[0] and origin[1] + size[1] <= canvas_size[1])
+
+
+def _build_glow_sprite(text, font, fill, radius, passes, mode):
+    """Unclipped glow for ``text`` drawn at (0, 0): (patch, offset) or (None, None)."""
+    l, t, r, b = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+    if r <= l or b <= t:
+        return None, None
+    m = blur_margin(radius, passes, mode) + INK_SLACK
+    patch = Image.new('RGBA', (r - l + 2 * m, b - t + 2 * m), (0, 0, 0, 0))
+    ImageDraw.Draw(patch).text((m - l, m - t), text, font=font, fill=fill)
+    return blur(patch, radius, passes, mode), (l - m, t - m)
+
+
+def text_glow(canvas, xy, text, font, fill, radius, passes, mode=None):
+    """Blurred glow patch for ``text`` drawn at ``xy`` on ``canvas``.
+
+    The returned patch may be shared with the sprite cache: read it, never
+    draw on it.
+    """
+    mode = mode or default_mode()
+    key = _sprite_key(xy, text, font, fill, radius, passes, mode)
+    if key is not None:
+        sprite = glow_sprites.get(key)
+        if sprite is None:
+            sprite = glow_sprites.put(key, _build_glow_sprite(text, font, fill, radius, passes, mode))
+        patch, offset = sprite
+        if patch is None:
+            return None, None
+        origin = (xy[0] + offset[0], xy[1] + offset[1])
+        if _inside(canvas.size, origin, patch.size):
+            return patch, origin
+    x, y = xy
+    return paint_patch(
+        canvas.size, text_bbox(canvas, xy, text, font),
+        lambda d, ox, oy: d.text((x - ox, y - oy), text, font=font, fill=fill),
+        radius, passes, mode,
+    )
+
+
+def draw_text(canvas, xy, text, font, fill):
+    """``ImageDraw.text`` on an RGBA canvas via a cached glyph mask."""
+    key = _sprite_key(xy, text, font)
+    if key is None or not isinstance(fill, tuple):
+        ImageDraw.Draw(canvas).text(xy, text, font=font, fill=fill)
+        return
+    sprite = text_masks.get(key)
+    if sprite is None:
+        l, t, r, b = ImageDraw.Draw(canvas).textbbox((0, 0), text, font=font)
+        mask = None
+        if r > l and b > t:
+            mask = Image.new('L', (r - l, b - t), 0)
+            ImageDraw.Draw(mask).text((-l, -t), text, font=font, fill=255)
+        sprite = text_masks.put(key, (mask, (l, t)))
+    mask, (dx, dy) = sprite
+    if mask is not None:
+        ink = fill if len(fill) == 4 else (*fill, 255)
+        canvas.paste(ink, (xy[0] + dx, xy[1] + dy), mask)
+
+
+def clear_caches():
+    glow_sprites.clear()
+    text_masks.clear()
+
+
+def composite_patch(card, patch, origin):
+    """In-place ``card = alpha_composite(card, full_layer)`` for a patch."""
+    if patch is not None:
+        card.alpha_composite(patch, dest=origin)
+    return card
+
+
+def blur_error(text, font, fill, radius, passes, mode=None):
+    """Max and mean per-channel difference of ``mode`` vs stacked blurs."""
+    exact, _ = _build_glow_sprite(text, font, fill, radius, passes, 'stacked')
+    if exact is None:
+        return 0, 0.0
+    approx, _ = _build_glow_sprite(text, font, fill, radius, passes, mode or BLUR_MODE)
+    # Recentre on the larger stacked patch so both share one frame
+    frame = Image.new('RGBA', exact.size, (0, 0, 0, 0))
+    off = ((exact.width - approx.width) // 2, (exact.height - approx.height) // 2)
+    frame.paste(approx, off)
+    diff = ImageChops.difference(exact, frame)
+    hist = diff.histogram()
+    worst = max(band[1] for band in diff.getextrema())
+    total = sum(i * n for band in range(4) for i, n in enumerate(hist[band * 256:(band + 1) * 256]))
+    return worst, total / (exact.width * exact.height * 4)
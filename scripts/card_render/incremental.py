@@ -0,0 +1,168 @@
+"""
+Incremental re-render for agents whose card was drawn recently.
+
+A cred refresh or a new badge changes one or two layers of a card, but
+compose() redraws every glow, pill and bar on a fresh plate. LayerCache
+keeps, per agent, the last card it composed together with the record it
+was drawn from, the plate under it and the box each agent layer touched
+(layout.draw_layers(..., track=True)). The next compose() for that agent
+diffs the record against the stored one and redraws only what changed:
+
+  1. the dirty box starts as the union of the changed layers' old boxes;
+  2. on a copy of the plate, the layers are drawn in order, skipping
+     unchanged layers whose box misses the dirty box; each changed layer
+     grows the dirty box to cover its new box;
+  3. if the box grew over a layer that was already skipped, step 2
+     starts over with the larger box;
+  4. the overlay (the v6 border) is composited over just the dirty box,
+     and that region is pasted into a copy of the previous card.
+
+Every drawing operation is per pixel and layers that don't meet the
+dirty box cannot differ inside it, so the result is byte-identical to a
+full compose(). A change to the aura (path or file contents), the spec
+or the render quality falls back to a full render.
+
+Entries are bounded by HELIXA_LAYER_CACHE_MB (default 128) of card and
+custom-aura plate pixels, least recently rendered evicted first.
+"""
+import copy
+import os
+
+from . import layout
+from .assets import file_digest
+from .lru import LRUCache, image_bytes
+from .quality import current, is_draft
+from .trace import span
+
+_CACHE_BYTES = int(float(os.environ.get('HELIXA_LAYER_CACHE_MB', 128)) * 1024 * 1024)
+
+
+class _Entry:
+    __slots__ = ('spec', 'quality', 'aura', 'record', 'base', 'shared', 'card', 'extents')
+
+
+def _entry_bytes(entry):
+    return image_bytes(entry.card) + (0 if entry.shared else image_bytes(entry.base))
+
+
+def _aura_key(path):
+    return (path, file_digest(path)) if path else None
+
+
+def _meets(a, b):
+    return a is not None and b is not None and a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(boxes):
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+class LayerCache:
+    """Last composed card per agent; compose() redraws only the changed layers."""
+
+    def __init__(self, max_bytes=_CACHE_BYTES):
+        self.entries = LRUCache(max_bytes, _entry_bytes)
+        self.counts = {'full': 0, 'partial': 0, 'unchanged': 0}
+
+    def compose(self, spec, record, key=None):
+        """Card for ``record`` (RGBA), equal to layout.compose(spec, record).
+
+        ``key`` identifies the agent (default: the record's id, else its
+        name). The returned card is shared with the cache: copy it before
+        drawing on it.
+        """
+        key = key or record.get('id') or record.get('name')
+        entry = self.entries.get(key)
+        if (entry is None or entry.spec is not spec or entry.quality != current()
+                or entry.aura != _aura_key(record.get('aura'))):
+            return self._full(key, spec, record)
+        changed = {i for i, (kind, params) in enumerate(spec['layers'])
+                   if any(record.get(f) != entry.record.get(f) for f in layout.layer_fields(kind, params))}
+        if not changed:
+            self.counts['unchanged'] += 1
+            return entry.card
+        return self._partial(key, entry, record, changed)
+
+    def update(self, key, changes):
+        """Apply ``changes`` to the agent's last record and re-render; KeyError if not cached."""
+        entry = self.entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return self.compose(entry.spec, dict(entry.record, **changes), key)
+
+    def _store(self, key, spec, record, base, shared, card, extents):
+        entry = _Entry()
+        entry.spec = spec
+        entry.quality = current()
+        entry.aura = _aura_key(record.get('aura'))
+        entry.record = copy.deepcopy(record)
+        entry.base = base
+        entry.shared = shared
+        entry.card = card
+        entry.extents = extents
+        self.entries.put(key, entry)
+        return card
+
+    def _full(self, key, spec, record):
+        self.counts['full'] += 1
+        with span(f"compose_{spec['tier']}"):
+            with span('plate'):
+                base, shared = layout.base_plate(spec, record.get('aura'))
+            card, extents = layout.draw_layers(spec, base.copy(), record, track=True)
+            if not is_draft():
+                card = layout.apply_overlay(spec, card)
+        return self._store(key, spec, record, base, shared, card, extents)
+
+    def _partial(self, key, entry, record, changed):
+        self.counts['partial'] += 1
+        spec = entry.spec
+        with span(f"redraw_{spec['tier']}"):
+            dirty = _union(entry.extents[i] for i in changed)
+            while True:
+                scratch, drawn, dirty, restart = self._redraw(entry, record, changed, dirty)
+                if not restart:
+                    break
+            extents = {**entry.extents, **drawn}
+            if dirty is None:
+                card = entry.card
+            else:
+                region = scratch.crop(dirty)
+                if not is_draft():
+                    region = layout.apply_overlay(spec, region, dirty)
+                card = entry.card.copy()
+                card.paste(region, dirty[:2])
+        return self._store(key, spec, record, entry.base, entry.shared, card, extents)
+
+    @staticmethod
+    def _redraw(entry, record, changed, dirty):
+        """One pass over the layers in order, growing ``dirty`` as changed layers land.
+
+        Returns ``(scratch, drawn, dirty, restart)``; ``restart`` is set when
+        the dirty box grew over a layer this pass had already skipped.
+        """
+        scratch = entry.base.copy()
+        drawn = {}
+        skipped = []
+        for i in range(len(entry.spec['layers'])):
+            if i not in changed and not _meets(entry.extents[i], dirty):
+                skipped.append(i)
+                continue
+            scratch, extents = layout.draw_layers(entry.spec, scratch, record, only=(i,), track=True)
+            drawn.update(extents)
+            if i in changed:
+                grown = _union([dirty, extents[i]])
+                if grown != dirty:
+                    dirty = grown
+                    if any(_meets(entry.extents[j], dirty) for j in skipped):
+                        return scratch, drawn, dirty, True
+        return scratch, drawn, dirty, False
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return dict(self.entries.stats(), **self.counts)
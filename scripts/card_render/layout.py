@@ -0,0 +1,640 @@
+"""
+The one compositing engine behind every card design.
+
+compose(spec, record) draws a layout spec (see card_render.specs) for an
+agent record (see card_render.manifest). A spec has three step lists,
+each a tuple of ``(kind, params)``:
+
+  plate    static layers, bottom to top: background, robot, aura,
+           gradient, rings / border. Built once and cached.
+  layers   agent text: text, badges, stats, traits, bio.
+  overlay  static layers drawn over the agent text (the v6 ornate border).
+
+Plates come from card_render.assets.get_plate(). What gets cached:
+
+  underlay     the steps before the aura, plus the aura backdrop if any.
+               Shared by every spec with the same steps.
+  <name>       the whole plate with the default aura, or without any aura
+               when the default aura file is missing.
+  <name>-flat  drafts only: the plate with the overlay flattened in.
+
+An agent with its own aura starts from the underlay and has the aura,
+gradient and border composited per card. A draft skips that and pastes
+the aura over the flat plate, on top of the gradient and border.
+
+Full-card layers (the gradient band, the ornate border) are composited
+in place over just their visible tiles (_composite_tiles), so a card
+allocates tile-sized temporaries rather than a second full canvas.
+
+draw_layers(..., track=True) also reports the box each agent layer
+touched, which card_render.incremental uses to redraw only the layers an
+update changed.
+
+Glows are ``(fill, radius, passes)``. ``blend`` says how a glow patch
+lands: 'over' alpha-composites it; 'paste' pastes it through its own
+alpha, the way render-card-tiers.py always has.
+"""
+import contextvars
+import hashlib
+import json
+import os
+
+from PIL import Image, ImageDraw, ImageEnhance
+
+from .assets import asset_path, get_plate
+from .auras import aura_sprite
+from .border import fade_inner_edge, fullart_falloff, tiers_falloff
+from .fonts import font, font_path
+from .glow import INK_SLACK, composite_patch, draw_text, paint_patch, text_bbox, text_glow
+from .overlays import gradient_band, paint_rings, ring_border
+from .quality import is_draft, render_quality, resample
+from .sprites import cutout
+from .text import wrap
+from .trace import span, traced
+
+FALLOFFS = {'tiers': tiers_falloff, 'fullart': fullart_falloff}
+ENHANCERS = {'color': ImageEnhance.Color, 'brightness': ImageEnhance.Brightness}
+
+# Boxes drawn on by the current agent layer (see draw_layers); None when not tracking
+_damage = contextvars.ContextVar('layer_damage', default=None)
+
+# Static layers composited tile by tile (see _composite_tiles): key -> (layer, visible tiles)
+OVERLAY_TILE = 32
+OVERLAY_BOX_PIXELS = 65536
+_layer_tiles = {}
+
+
+def fingerprint(value):
+    """Short stable digest of spec data (plate cache names, output cache keys)."""
+    blob = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:12]
+
+
+# --- plate steps: step(card, params, state) -> card --------------------------
+
+@traced('background')
+def _background(card, params, state):
+    bg = Image.open(asset_path(params['asset'])).convert('RGBA')
+    bg = bg.resize(state['size'], params['resample'])
+    for name, factor in params['enhance']:
+        bg = ENHANCERS[name](bg).enhance(factor)
+    return bg
+
+
+@traced('robot')
+def _robot(card, params, state):
+    """Cut-out robot scaled by ``scale``, centred, top cropped by height // top_div."""
+    path = asset_path(params['asset'])
+    try:
+        robot = cutout(path)
+    except ImportError:
+        print('WARNING: rembg not available, using the robot image as-is')
+        robot = Image.open(path).convert('RGBA')
+    w, h = state['size']
+    scale = params['scale']
+    robot = robot.resize((int(robot.width * scale), int(robot.height * scale)), Image.LANCZOS)
+    left = max(0, (robot.width - w) // 2)
+    top = robot.height // params['top_div']
+    if params.get('screen'):
+        # TV screen centre in source pixels, scaled and shifted by the crop
+        sx, sy = params['screen']
+        state['screen'] = (int(sx * scale) - left, int(sy * scale) - top)
+    robot = robot.crop((left, top, min(robot.width, left + w), min(robot.height, top + h)))
+    card.paste(robot, ((w - robot.width) // 2, 0), robot)
+    return card
+
+
+def _aura_xy(params, state):
+    center = params['center'] or state['screen']
+    size = params['sizes'][-1]
+    return center[0] - size // 2, center[1] - size // 2
+
+
+def _backdrop(card, params, state):
+    """Dark screen behind the aura slot, so the aura reads on the robot."""
+    backdrop = params.get('backdrop')
+    if backdrop is None:
+        return card
+    x, y = _aura_xy(params, state)
+    pad, size = backdrop['pad'], params['sizes'][-1]
+    box = [x - pad, y - pad, x + size + pad, y + size + pad]
+    patch, origin = paint_patch(card.size, (box[0], box[1], box[2] + 1, box[3] + 1), lambda d, ox, oy: d.rounded_rectangle(
+        [box[0] - ox, box[1] - oy, box[2] - ox, box[3] - oy], radius=backdrop['radius'], fill=backdrop['fill']))
+    return composite_patch(card, patch, origin)
+
+
+def _aura_filter(params):
+    # NEAREST keeps pixel art crisp in drafts too; smooth filters drop to BILINEAR
+    return params['resample'] if params['resample'] == Image.NEAREST else resample(params['resample'])
+
+
+@traced('aura')
+def place_aura(card, params, state, path=None):
+    """Paste an aura (the spec's default unless ``path``) into the aura slot."""
+    aura = aura_sprite(path or asset_path(params['asset']), params['sizes'], _aura_filter(params))
+    card.paste(aura, _aura_xy(params, state), aura)
+    return card
+
+
+@traced('gradient')
+def _gradient(card, params, state):
+    band, origin = gradient_band(state['size'], params['color'], params['start'])
+    tiles = _layer_tiles_for(('gradient', state['size'], params['color'], params['start']), band)
+    return _composite_tiles(card, band, tiles, origin)
+
+
+def _paint_rings(card, colors, state):
+    box = state.get('box')
+    if box is None:
+        return paint_rings(card, colors)
+    layer, mask = ring_border(state['size'], tuple(colors))
+    card.paste(layer.crop(box), (0, 0), mask.crop(box))
+    return card
+
+
+@traced('border')
+def _rings(card, params, state):
+    return _paint_rings(card, params['colors'], state)
+
+
+def _build_border(params, size):
+    path = asset_path(params['asset'])
+    if not os.path.exists(path):
+        return None
+    border = Image.open(path).convert('RGBA').resize(size, params['resample'])
+    return fade_inner_edge(border, FALLOFFS[params['falloff']])
+
+
+def _visible_tiles(layer, tile=OVERLAY_TILE, max_pixels=OVERLAY_BOX_PIXELS):
+    """Boxes covering every pixel of ``layer`` that isn't fully transparent.
+
+    The layer is cut into ``tile``-px squares; visible squares next to each
+    other in a row of tiles are merged into one box, and a box is extended
+    down while the next row has a box with the same columns and it stays
+    under ``max_pixels`` (so a frame comes out as a few strips).
+    """
+    alpha = layer.getchannel('A')
+    w, h = layer.size
+    boxes = []
+    open_boxes = {}
+    for top in range(0, h, tile):
+        bottom = min(top + tile, h)
+        runs = []
+        start = None
+        for left in range(0, w + tile, tile):
+            visible = left < w and alpha.crop((left, top, min(left + tile, w), bottom)).getbbox() is not None
+            if visible and start is None:
+                start = left
+            elif not visible and start is not None:
+                runs.append((start, min(left, w)))
+                start = None
+        below = {}
+        for run in runs:
+            box = open_boxes.pop(run, None)
+            if box is not None and (run[1] - run[0]) * (bottom - box[1]) > max_pixels:
+                boxes.append(box)
+                box = None
+            below[run] = [run[0], box[1] if box else top, run[1], bottom]
+        boxes += open_boxes.values()
+        open_boxes = below
+    boxes += open_boxes.values()
+    return [tuple(box) for box in boxes]
+
+
+def _layer_tiles_for(key, layer):
+    cached = _layer_tiles.get(key)
+    if cached is None or cached[0] is not layer:
+        cached = _layer_tiles[key] = (layer, _visible_tiles(layer))
+    return cached[1]
+
+
+def _composite_tiles(card, layer, tiles, origin=(0, 0), box=None):
+    """Alpha-composite ``layer`` (placed at ``origin``) onto ``card`` in place, tile by tile.
+
+    Only ``tiles`` (boxes in ``layer``) are composited, and each one only
+    needs tile-sized temporaries, where Image.alpha_composite() and even
+    Image.alpha_composite(dest=...) build a canvas the size of the layer.
+    A fully transparent pixel leaves the card pixel as it was, so the
+    result is the same. With ``box``, ``card`` is that crop of the card.
+    """
+    ox, oy = origin
+    bx, by, right, bottom = box or (0, 0, ox + layer.width, oy + layer.height)
+    for l, t, r, b in tiles:
+        l, t, r, b = max(l + ox, bx), max(t + oy, by), min(r + ox, right), min(b + oy, bottom)
+        if r > l and b > t:
+            card.alpha_composite(layer, (l - bx, t - by), (l - ox, t - oy, r - ox, b - oy))
+    return card
+
+
+@traced('border')
+def _border(card, params, state):
+    """Ornate border asset with its inner edge faded (drawn rings if the asset is missing)."""
+    size = state['size']
+    name = f'border-{fingerprint(params)}'
+    border = get_plate(name, [asset_path(params['asset'])], (size,), lambda: _build_border(params, size))
+    if border is not None:
+        return _composite_tiles(card, border, _layer_tiles_for(name, border), box=state.get('box'))
+    if params['fallback']:
+        _paint_rings(card, params['fallback'], state)
+    return card
+
+
+PLATE_STEPS = {
+    'background': _background,
+    'robot': _robot,
+    'gradient': _gradient,
+    'rings': _rings,
+    'border': _border,
+}
+
+
+def _run(steps, card, state):
+    for kind, params in steps:
+        card = PLATE_STEPS[kind](card, params, state)
+    return card
+
+
+def _split(spec):
+    """(steps before the aura, aura params or None, steps after it)."""
+    plate = spec['plate']
+    for i, (kind, params) in enumerate(plate):
+        if kind == 'aura':
+            return plate[:i], params, plate[i + 1:]
+    return plate, None, ()
+
+
+def _assets(steps):
+    return [asset_path(params['asset']) for kind, params in steps if 'asset' in params]
+
+
+def _build_underlay(before, slot, size):
+    state = {'size': size}
+    card = _run(before, Image.new('RGBA', size, (0, 0, 0, 0)), state)
+    if slot is not None:
+        card = _backdrop(card, slot, state)
+    return card, state
+
+
+def _underlay(spec, with_slot):
+    """Cached (card, state) for the steps below the aura."""
+    before, aura, _ = _split(spec)
+    # Only an aura backdrop makes the slot differ from the bare underlay
+    slot = aura if with_slot and aura is not None and aura.get('backdrop') else None
+    layout = (spec['size'], before, slot)
+    return get_plate(f'underlay-{fingerprint(layout)}', _assets(before), (fingerprint(layout),),
+                     lambda: _build_underlay(before, slot, spec['size']))
+
+
+def _build_plate(spec, variant, flat):
+    """(card, state) for a plate variant: 'default' aura, 'bare' (no aura) or 'slot' (empty aura slot).
+
+    Always built at final quality: a plate is built once, and drafts
+    should not depend on which quality happened to build it first.
+    """
+    _, aura, after = _split(spec)
+    with render_quality('final'):
+        card, state = _underlay(spec, variant != 'bare')
+        card = card.copy()
+        state = dict(state)
+        if variant == 'default':
+            place_aura(card, aura, state)
+        card = _run(after, card, state)
+        if flat:
+            card = _run(spec['overlay'], card, state)
+    return card, state
+
+
+def _plate(spec, variant, flat=False):
+    name = f"{spec['name']}-{variant}" + ('-flat' if flat else '')
+    assets = _assets(spec['plate'] + spec['overlay'])
+    return get_plate(name, assets, (fingerprint([spec['size'], spec['plate'], spec['overlay']]),),
+                     lambda: _build_plate(spec, variant, flat))
+
+
+def _default_variant(spec):
+    _, aura, _ = _split(spec)
+    if aura is not None and os.path.exists(asset_path(aura['asset'])):
+        return 'default'
+    return 'bare'
+
+
+def _custom_aura(spec, path):
+    _, aura, _ = _split(spec)
+    return (aura is not None and path and os.path.exists(path)
+            and os.path.abspath(path) != os.path.abspath(asset_path(aura['asset'])))
+
+
+def base_plate(spec, aura_path=None):
+    """(static layers under the agent text, shared) for this aura.
+
+    A shared image is a cached plate: copy it before drawing.
+    """
+    draft = is_draft()
+    if not _custom_aura(spec, aura_path):
+        card, _ = _plate(spec, _default_variant(spec), flat=draft)
+        return card, True
+    _, aura, after = _split(spec)
+    if draft:
+        card, state = _plate(spec, 'slot', flat=True)
+        return place_aura(card.copy(), aura, state, aura_path), False
+    card, state = _underlay(spec, True)
+    card = place_aura(card.copy(), aura, state, aura_path)
+    return _run(after, card, dict(state)), False
+
+
+@traced('plate')
+def plate(spec, aura_path=None):
+    """Fresh copy of the static layers under the agent text, for this aura."""
+    card, shared = base_plate(spec, aura_path)
+    return card.copy() if shared else card
+
+
+def apply_overlay(spec, card, box=None):
+    """Draw the spec's overlay; with ``box``, ``card`` is just that crop of the card."""
+    return _run(spec['overlay'], card, {'size': spec['size'], 'box': box})
+
+
+def warm(spec):
+    """Build the plates a default-aura card of ``spec`` needs (once per process / worker)."""
+    card, state = _plate(spec, _default_variant(spec), flat=is_draft())
+    if not is_draft():
+        # Builds and caches the overlay layers (the border) along the way
+        _run(spec['overlay'], card.copy(), dict(state))
+
+
+def aura_jobs(spec, record):
+    """``(path, sizes, resample)`` of the aura sprite a card for ``record`` needs, if custom (for auras.prefetch)."""
+    path = record.get('aura')
+    if not _custom_aura(spec, path):
+        return []
+    _, aura, _ = _split(spec)
+    return [(path, aura['sizes'], _aura_filter(aura))]
+
+
+def prebuild(spec):
+    """Build every plate any card of ``spec`` can use, at both qualities (for compiling)."""
+    for quality in ('final', 'draft'):
+        with render_quality(quality):
+            warm(spec)
+    _, aura, _ = _split(spec)
+    if aura is not None:
+        _underlay(spec, True)
+        _plate(spec, 'slot', flat=True)
+
+
+def assets(*specs):
+    """Every asset and font file the specs read (for output cache keys)."""
+    paths = []
+    for spec in specs:
+        paths += _assets(spec['plate'] + spec['overlay'])
+        faces = [params['font'][0] for kind, params in spec['layers'] if 'font' in params]
+        paths += [font_path(face) for face in faces]
+    return sorted(set(p for p in paths if p))
+
+
+# --- agent layers: layer(card, params, record) -> card -----------------------
+
+def _touch(box):
+    damage = _damage.get()
+    if damage is not None:
+        damage.append(box)
+
+
+def _touch_text(card, xy, text, text_font):
+    if _damage.get() is not None:
+        l, t, r, b = text_bbox(card, xy, text, text_font)
+        _touch((l - INK_SLACK, t - INK_SLACK, r + INK_SLACK, b + INK_SLACK))
+
+
+def _touch_patch(patch, origin):
+    # Only the visible part: fully transparent pixels leave the card as it was
+    if _damage.get() is not None:
+        box = patch.getbbox()
+        if box is not None:
+            _touch((origin[0] + box[0], origin[1] + box[1], origin[0] + box[2], origin[1] + box[3]))
+
+
+def _composite(card, patch, origin):
+    if patch is not None:
+        _touch_patch(patch, origin)
+    return composite_patch(card, patch, origin)
+
+
+def _rounded_rectangle(card, box, **kwargs):
+    _touch((box[0], box[1], box[2] + 1, box[3] + 1))
+    ImageDraw.Draw(card).rounded_rectangle(box, **kwargs)
+
+
+@traced('text_glow')
+def glow_text(card, xy, text, text_font, color, glow=None, blend='over'):
+    """Draw ``text`` with an optional ``(fill, radius, passes)`` glow behind it."""
+    if glow is not None:
+        fill, radius, passes = glow
+        patch, origin = text_glow(card, xy, text, text_font, fill, radius, passes)
+        if patch is not None:
+            _touch_patch(patch, origin)
+            if blend == 'paste':
+                card.paste(Image.alpha_composite(Image.new('RGBA', patch.size, (0, 0, 0, 0)), patch), origin, patch)
+            else:
+                card.alpha_composite(patch, dest=origin)
+    _touch_text(card, xy, text, text_font)
+    draw_text(card, xy, text, text_font, color)
+    return card
+
+
+def _glow_fill(color, alpha):
+    return (*color, alpha) if alpha is not None else color
+
+
+def _text(card, params, record):
+    text = params['text'] if 'text' in params else str(record.get(params['field']) or '')
+    if params.get('upper'):
+        text = text.upper()
+    text_font = font(*params['font'])
+    x, y = params['xy']
+    if params.get('align') == 'right':
+        if params.get('advance'):
+            x -= len(text) * params['advance']
+        else:
+            bbox = text_font.getbbox(text)
+            x -= bbox[2] - bbox[0]
+    return glow_text(card, (x, y), text, text_font, params['color'], params.get('glow'), params.get('blend', 'over'))
+
+
+def _pill(card, box, radius, color):
+    """Outlined rounded rectangle, composited (colours may be translucent)."""
+    patch, origin = paint_patch(card.size, (box[0], box[1], box[2] + 1, box[3] + 1), lambda d, ox, oy: d.rounded_rectangle(
+        [box[0] - ox, box[1] - oy, box[2] - ox, box[3] - oy], radius=radius, outline=color, width=1))
+    return _composite(card, patch, origin)
+
+
+@traced('badges')
+def _badges(card, params, record):
+    badges = record.get('badges') or ()
+    if params['only']:
+        badges = [b for b in params['only'] if b in badges]
+    badge_font = font(*params['font'])
+    pad_x, pad_y = params['pad']
+    radius, (glow_radius, glow_passes) = params['radius'], params['glow']
+    x, y = params['xy']
+    for badge in badges:
+        color = params['colors'].get(badge, params['default'])
+        if color is None:
+            continue
+        bbox = badge_font.getbbox(badge)
+        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        box = [x, y, x + tw + pad_x * 2, y + th + pad_y * 2]
+        txy = (x + pad_x, y + pad_y + params['text_dy'])
+        if params['glow_pill']:
+            # Pill and text glow together, then both are drawn sharp on top
+            def paint(d, ox, oy):
+                d.rounded_rectangle([box[0] - ox, box[1] - oy, box[2] - ox, box[3] - oy],
+                                    radius=radius, outline=color, width=1)
+                d.text((txy[0] - ox, txy[1] - oy), badge, fill=color, font=badge_font)
+            tb = text_bbox(card, txy, badge, badge_font)
+            ink = (min(box[0], tb[0]), min(box[1], tb[1]), max(box[2] + 1, tb[2]), max(box[3] + 1, tb[3]))
+            glow, origin = paint_patch(card.size, ink, paint, radius=glow_radius, passes=glow_passes)
+            card = _composite(card, glow, origin)
+            _rounded_rectangle(card, box, radius=radius, outline=color, width=1)
+            _touch_text(card, txy, badge, badge_font)
+            draw_text(card, txy, badge, badge_font, color)
+        else:
+            _rounded_rectangle(card, box, radius=radius, outline=color, width=1)
+            glow = (_glow_fill(color, params['glow_alpha']), glow_radius, glow_passes)
+            card = glow_text(card, txy, badge, badge_font, color, glow, params['blend'])
+        x += tw + pad_x * 2 + params['gap']
+    return card
+
+
+@traced('stat_bars')
+def _stat_bar(card, params, xy, label, value, color):
+    stat_font = font(*params['font'])
+    radius, passes = params['glow']
+    glow = (_glow_fill(color, params['glow_alpha']), radius, passes)
+    x, y = xy
+    card = glow_text(card, (x, y), label, stat_font, params['label_color'], glow, params['blend'])
+
+    dx, dy, bar_w, bar_h, bar_radius = params['bar']
+    bar_x, bar_y = x + dx, y + dy
+    _rounded_rectangle(card, [bar_x, bar_y, bar_x + bar_w, bar_y + bar_h], radius=bar_radius, fill=params['track'])
+    # Each renderer's own rounding, kept so output doesn't shift by a pixel
+    if params['clamp']:
+        fill_w = int(bar_w * min(value / 100, 1.0))
+    else:
+        fill_w = int(bar_w * value / 100)
+    fill_w = max(fill_w, params['min_fill'])
+    if fill_w > 0:
+        def paint(d, ox, oy):
+            d.rounded_rectangle([bar_x - ox, bar_y - oy, bar_x + fill_w - ox, bar_y + bar_h - oy],
+                                radius=bar_radius, fill=color)
+        fill_box = (bar_x, bar_y, bar_x + fill_w + 1, bar_y + bar_h + 1)
+        if params['fill_glow']:
+            glow_radius, glow_passes = params['fill_glow']
+            card = _composite(card, *paint_patch(card.size, fill_box, paint, glow_radius, glow_passes))
+        card = _composite(card, *paint_patch(card.size, fill_box, paint))
+
+    value_xy = (bar_x + bar_w + params['value_dx'], y)
+    return glow_text(card, value_xy, str(value), stat_font, params['value_color'] or color, glow, params['blend'])
+
+
+def _stats(card, params, record):
+    x, y = params['xy']
+    for i, (label, field, color) in enumerate(params['rows']):
+        card = _stat_bar(card, params, (x, y + i * params['spacing']), label, record[field], color)
+    return card
+
+
+@traced('trait_pills')
+def _traits(card, params, record):
+    trait_font = font(*params['font'])
+    pad_x, pad_y = params['pad']
+    x, y = params['xy']
+    for trait in (record.get('traits') or ())[:params['limit']]:
+        bbox = trait_font.getbbox(trait)
+        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        box = [x, y, x + tw + pad_x * 2, y + (params['height'] or th + pad_y * 2)]
+        txy = (x + pad_x, y + pad_y + params['text_dy'])
+        if not params['pill_over_text']:
+            card = _pill(card, box, params['radius'], params['color'])
+        card = glow_text(card, txy, trait, trait_font, params['text_color'], params['glow'])
+        if params['pill_over_text']:
+            card = _pill(card, box, params['radius'], params['color'])
+        x += tw + pad_x * 2 + params['gap']
+    return card
+
+
+def _bio(card, params, record):
+    bio = record.get('bio') or ''
+    bio_font = font(*params['font'])
+    with span('text_layout'):
+        lines = wrap(bio, bio_font, params['width'], params.get('max_lines'))
+    x, y = params['xy']
+    for i, line in enumerate(lines):
+        card = glow_text(card, (x, y + i * params.get('line_height', 16)), line, bio_font, params['color'],
+                         params.get('glow'), params.get('blend', 'over'))
+    return card
+
+
+LAYER_STEPS = {
+    'text': _text,
+    'badges': _badges,
+    'stats': _stats,
+    'traits': _traits,
+    'bio': _bio,
+}
+
+# Record fields each layer kind reads
+LAYER_FIELDS = {
+    'text': lambda params: (params['field'],) if 'field' in params else (),
+    'badges': lambda params: ('badges',),
+    'stats': lambda params: tuple(field for _, field, _ in params['rows']),
+    'traits': lambda params: ('traits',),
+    'bio': lambda params: ('bio',),
+}
+
+
+def layer_fields(kind, params):
+    return LAYER_FIELDS[kind](params)
+
+
+def _bounds(boxes, size):
+    """Union of ``boxes`` clipped to the card, or None if empty."""
+    if not boxes:
+        return None
+    l = max(0, min(b[0] for b in boxes))
+    t = max(0, min(b[1] for b in boxes))
+    r = min(size[0], max(b[2] for b in boxes))
+    b = min(size[1], max(b[3] for b in boxes))
+    return (l, t, r, b) if r > l and b > t else None
+
+
+def draw_layers(spec, card, record, only=None, track=False):
+    """Draw the spec's agent layers (or just the indices in ``only``) onto ``card``.
+
+    Returns ``(card, extents)``. With ``track``, ``extents`` maps each
+    drawn layer's index to the box it touched (None if it drew nothing).
+    """
+    extents = {}
+    for i, (kind, params) in enumerate(spec['layers']):
+        if only is not None and i not in only:
+            continue
+        if not track:
+            card = LAYER_STEPS[kind](card, params, record)
+            continue
+        token = _damage.set([])
+        try:
+            card = LAYER_STEPS[kind](card, params, record)
+            extents[i] = _bounds(_damage.get(), card.size)
+        finally:
+            _damage.reset(token)
+    return card, extents
+
+
+def compose(spec, record):
+    """Composite ``record`` onto ``spec`` in memory and return the card (RGBA)."""
+    with span(f"compose_{spec['tier']}"):
+        card = plate(spec, record.get('aura'))
+        card, _ = draw_layers(spec, card, record)
+        if not is_draft():
+            card = apply_overlay(spec, card)
+        return card
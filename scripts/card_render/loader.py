@@ -0,0 +1,21 @@
+"""
+Import the hyphen-named renderer scripts (render-card-tiers.py, ...) as
+modules so services in this package can call their functions directly.
+"""
+import importlib.util
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(name):
+    """Import scripts/<name>.py once and return the module."""
+    module_name = name.replace('-', '_')
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPTS_DIR, f'{name}.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
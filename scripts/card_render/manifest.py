@@ -0,0 +1,139 @@
+"""
+Agent manifests for batch rendering.
+
+A manifest is a JSONL file (one agent object per line) or a CSV file with
+a header row. Records are streamed, never loaded whole, so manifests with
+tens of thousands of agents are fine. In CSV, ``badges`` and ``traits``
+are ``|``-separated.
+
+Recognised fields: id (or tokenId), name, framework, cred, risk, auto,
+badges, traits, bio, aura, and an optional tier override.
+"""
+import csv
+import json
+import math
+import os
+import re
+import sys
+
+TIERS = ('basic', 'holo', 'fullart')
+
+
+def tier_for_cred(cred):
+    """Basic 0-25, Holo 26-60, Full Art 61+ (see render-card-tiers.py)."""
+    if cred <= 25:
+        return 'basic'
+    if cred <= 60:
+        return 'holo'
+    return 'fullart'
+
+
+def _as_list(raw, field, line_no):
+    value = raw.get(field)
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split('|') if v.strip()]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f'record {line_no}: {field} must be a list or |-separated string, got {type(value).__name__}')
+    return [str(v) for v in value]
+
+
+def _as_int(raw, field, line_no, default=0):
+    value = raw.get(field)
+    if value is None or value == '':
+        return default
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        raise ValueError(f'record {line_no}: {field} must be a number, got {value!r}') from None
+    if not math.isfinite(number):
+        raise ValueError(f'record {line_no}: {field} must be finite, got {value!r}')
+    return int(number)
+
+
+def _as_text(raw, field, line_no):
+    value = raw.get(field)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f'record {line_no}: {field} must be a string, got {type(value).__name__}')
+    return value
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'agent'
+
+
+def normalize(raw, line_no=0):
+    """Coerce a raw manifest row into the dict the tier renderers expect."""
+    if not isinstance(raw, dict):
+        raise ValueError(f'record {line_no}: expected an object, got {type(raw).__name__}')
+    name = _as_text(raw, 'name', line_no).strip()
+    if not name:
+        raise ValueError(f'record {line_no}: missing name')
+    agent_id = raw.get('id', raw.get('tokenId'))
+    record = {
+        'id': str(agent_id) if agent_id not in (None, '') else f'{slugify(name)}-{line_no}',
+        'name': name,
+        'framework': (_as_text(raw, 'framework', line_no) or 'CUSTOM').upper(),
+        'cred': _as_int(raw, 'cred', line_no),
+        'risk': _as_int(raw, 'risk', line_no),
+        'auto': _as_int(raw, 'auto', line_no),
+        'badges': [b.upper() for b in _as_list(raw, 'badges', line_no)],
+        'traits': _as_list(raw, 'traits', line_no),
+        'bio': _as_text(raw, 'bio', line_no),
+        'aura': _as_text(raw, 'aura', line_no) or None,
+    }
+    tier = raw.get('tier') or tier_for_cred(record['cred'])
+    if tier not in TIERS:
+        raise ValueError(f'record {line_no}: unknown tier {tier!r}')
+    record['tier'] = tier
+    return record
+
+
+def _open(path):
+    return sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+
+
+def iter_raw(path):
+    """Yield (line_no, row) from a JSONL or CSV manifest: a dict per CSV row, the text of each JSONL line.
+
+    JSONL lines are decoded by parse_row(), so one bad line is just an
+    invalid record.
+    """
+    is_csv = path != '-' and os.path.splitext(path)[1].lower() == '.csv'
+    f = _open(path)
+    try:
+        if is_csv:
+            for i, row in enumerate(csv.DictReader(f), start=2):
+                yield i, row
+        else:
+            for i, line in enumerate(f, start=1):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield i, line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def parse_row(row, line_no=0):
+    """Raw manifest dict for a row from iter_raw()."""
+    if not isinstance(row, str):
+        return row
+    try:
+        return json.loads(row)
+    except ValueError as e:
+        raise ValueError(f'record {line_no}: invalid JSON ({e})') from None
+
+
+def read_manifest(path, errors=None):
+    """Stream normalized records. Bad rows go to ``errors`` if given, else raise."""
+    for line_no, raw in iter_raw(path):
+        try:
+            yield normalize(parse_row(raw, line_no), line_no)
+        except (ValueError, TypeError) as e:
+            if errors is None:
+                raise
+            errors.append(str(e))
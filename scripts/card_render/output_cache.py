@@ -0,0 +1,165 @@
+"""
+Content-addressed cache of rendered cards.
+
+Every card gets a render key: the SHA-256 of the agent record (minus its
+id), the tier, the hashes of every asset and font the renderer reads, the
+renderer script itself, the layout spec fingerprint, RENDERER_VERSION,
+the glow blur mode and the render quality. Rendered
+files are stored once per key under <cache>/cards/, and a sidecar index in
+the output directory maps agent ids to the key of their current card.
+
+On a re-run an agent whose key still matches the index (and whose output
+file still exists) is skipped outright. An agent whose key is already in
+the store (e.g. a card that changed and changed back, or two identical
+agents) gets the stored file linked in. Only genuinely new cards are
+rendered. Rendered files are hard-linked into the store (copied across
+filesystems), and save() trims the store to HELIXA_CARD_STORE_MB
+(default 1024), dropping the least recently used cards first.
+
+Bump RENDERER_VERSION when shared drawing code in card_render changes
+output; edits to the renderer scripts and layout specs are picked up
+automatically.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from . import glow
+from .assets import file_digest
+from .sprites import CACHE_DIR, rembg_version
+
+RENDERER_VERSION = 1
+INDEX_NAME = '.card-index.json'
+STORE_BYTES = int(float(os.environ.get('HELIXA_CARD_STORE_MB', 1024)) * 1024 * 1024)
+
+# Record fields that affect the rendered card
+CARD_FIELDS = ('tier', 'name', 'framework', 'cred', 'risk', 'auto', 'badges', 'traits', 'bio')
+
+
+def record_fingerprint(record):
+    fields = {k: record.get(k) for k in CARD_FIELDS}
+    aura = record.get('aura')
+    fields['aura'] = file_digest(aura) if aura else None
+    return fields
+
+
+class OutputCache:
+    def __init__(self, output_dir, renderer_path, assets, cache_dir=None, force=False, quality='final',
+                 layout=None):
+        self.output_dir = output_dir
+        self.store_dir = os.path.join(cache_dir or CACHE_DIR, 'cards')
+        self.index_path = os.path.join(output_dir, INDEX_NAME)
+        self.force = force
+        self.index = self._load_index()
+        self._lock = threading.Lock()
+        self._base = {
+            'version': RENDERER_VERSION,
+            'renderer': file_digest(renderer_path),
+            'assets': sorted((os.path.basename(p), file_digest(p)) for p in assets),
+            'rembg': rembg_version(),
+            'blur': glow.BLUR_MODE,
+            'quality': quality,
+            'layout': layout,
+        }
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def key(self, record, variant='png'):
+        """Render key for ``record`` encoded as ``variant`` (an Encoding tag)."""
+        payload = dict(self._base, variant=variant, card=record_fingerprint(record))
+        blob = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _stored(self, key, out_paths):
+        """Store paths for a card's output files (one per size, in order)."""
+        stored = []
+        for i, path in enumerate(out_paths):
+            suffix = f'.{i}' if i else ''
+            ext = os.path.splitext(path)[1]
+            stored.append(os.path.join(self.store_dir, key[:2], f'{key}{suffix}{ext}'))
+        return stored
+
+    def restore(self, agent_id, key, out_paths):
+        """True if ``out_paths`` already hold (or now link to) the card for ``key``."""
+        if self.force:
+            return False
+        if self.index.get(agent_id) == key and all(os.path.exists(p) for p in out_paths):
+            return True
+        stored = self._stored(key, out_paths)
+        if all(os.path.exists(p) for p in stored):
+            for src, dst in zip(stored, out_paths):
+                _link(src, dst)
+                _touch(src)
+            self.commit(agent_id, key)
+            return True
+        return False
+
+    def store(self, agent_id, key, out_paths):
+        """Record a freshly rendered card in the content store and the index."""
+        for out_path, stored in zip(out_paths, self._stored(key, out_paths)):
+            if not os.path.exists(stored):
+                os.makedirs(os.path.dirname(stored), exist_ok=True)
+                _link(out_path, stored)
+        self.commit(agent_id, key)
+
+    def commit(self, agent_id, key):
+        with self._lock:
+            self.index[agent_id] = key
+
+    def save(self):
+        with self._lock:
+            tmp = f'{self.index_path}.{os.getpid()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self.index, f, sort_keys=True)
+            os.replace(tmp, self.index_path)
+        self.prune()
+
+    def prune(self, max_bytes=None):
+        """Delete the least recently used stored files until the store holds at most ``max_bytes``."""
+        max_bytes = STORE_BYTES if max_bytes is None else max_bytes
+        files = []
+        try:
+            shards = [entry.path for entry in os.scandir(self.store_dir) if entry.is_dir()]
+        except OSError:
+            return
+        for shard in shards:
+            try:
+                for entry in os.scandir(shard):
+                    if entry.is_file() and not entry.name.endswith('.tmp'):
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # already pruned by another run
+            total -= size
+
+
+def _link(src, dst):
+    """Hard-link ``src`` to ``dst`` (copy across filesystems)."""
+    tmp = f'{dst}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
@@ -0,0 +1,102 @@
+"""
+Precomputed gradient and ring-border layers.
+
+The bottom readability gradient used to be drawn one ``draw.line`` per
+row, and the drawn borders one rectangle outline per ring with colours
+interpolated in Python. Both are now built from ramps: a one-pixel
+column (or row) of values is stretched across the card with a NEAREST
+resize, and per-ring colours are applied to a distance-to-edge map with
+``Image.point`` lookup tables. Layers are cached per (size, colours,
+start row / ring colours) and must be treated as read-only.
+
+Both reproduce the drawn versions exactly: a line or outline drawn with
+an RGBA fill on an RGBA image replaces the pixel, which is what pasting
+the layer through its mask does.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageChops
+
+
+@lru_cache(maxsize=32)
+def bottom_gradient(size, color, start_y, max_alpha=220):
+    """Transparent down to ``start_y``, then ``color`` with alpha ramping to ``max_alpha``.
+
+    Row ``y >= start_y`` gets alpha ``int(max_alpha * (y - start_y) / (h - start_y))``.
+    """
+    w, h = size
+    rows = h - start_y
+    layer = Image.new('RGBA', size, (0, 0, 0, 0))
+    if rows <= 0:
+        return layer
+    ramp = bytes(int(max_alpha * i / rows) for i in range(rows))
+    alpha = Image.new('L', size, 0)
+    alpha.paste(Image.frombytes('L', (1, rows), ramp).resize((w, rows), Image.NEAREST), (0, start_y))
+    layer.paste((*color, 0), (0, start_y, w, h))
+    layer.putalpha(alpha)
+    return layer
+
+
+@lru_cache(maxsize=32)
+def gradient_band(size, color, start_y, max_alpha=220):
+    """The part of bottom_gradient() from ``start_y`` down: (band, (0, start_y))."""
+    w, h = size
+    return bottom_gradient(size, color, start_y, max_alpha).crop((0, start_y, w, h)), (0, start_y)
+
+
+def _edge_ramp(n):
+    """Distance to the nearer end for each of ``n`` positions, capped at 255."""
+    return bytes(min(i, n - 1 - i, 255) for i in range(n))
+
+
+@lru_cache(maxsize=8)
+def edge_distance(size):
+    """'L' map of each pixel's distance to the nearest card edge (capped at 255)."""
+    w, h = size
+    across = Image.frombytes('L', (w, 1), _edge_ramp(w)).resize(size, Image.NEAREST)
+    down = Image.frombytes('L', (1, h), _edge_ramp(h)).resize(size, Image.NEAREST)
+    return ImageChops.darker(across, down)
+
+
+@lru_cache(maxsize=32)
+def ring_border(size, ring_colors):
+    """(layer, mask) that paints ring ``i`` (``i`` px in from the edge) ``ring_colors[i]``."""
+    dist = edge_distance(size)
+    pad = [0] * (256 - len(ring_colors))
+    bands = [dist.point([c[band] for c in ring_colors] + pad) for band in range(4)]
+    mask = dist.point([255] * len(ring_colors) + pad)
+    return Image.merge('RGBA', bands), mask
+
+
+def paint_rings(card, ring_colors):
+    """Replace the outer ``len(ring_colors)`` rings of ``card`` in place."""
+    layer, mask = ring_border(card.size, tuple(ring_colors))
+    card.paste(layer, (0, 0), mask)
+    return card
+
+
+def fade_rings(color1, color2, width, alpha_step=20):
+    """Ring colours fading from ``color1`` (outermost) toward ``color2``."""
+    rings = []
+    for i in range(width):
+        alpha = 255 - int(i * alpha_step)
+        r = color1[0] + int((color2[0] - color1[0]) * i / width)
+        g = color1[1] + int((color2[1] - color1[1]) * i / width)
+        b = color1[2] + int((color2[2] - color1[2]) * i / width)
+        rings.append((r, g, b, alpha))
+    return tuple(rings)
+
+
+def palette_rings(palette, width, alpha_step=10):
+    """Ring colours interpolated through ``palette``, outermost ring first."""
+    rings = []
+    for i in range(width):
+        t = i / width
+        ci = min(int(t * (len(palette) - 1)), len(palette) - 2)
+        frac = (t * (len(palette) - 1)) - ci
+        c1, c2 = palette[ci], palette[ci + 1]
+        r = int(c1[0] + (c2[0] - c1[0]) * frac)
+        g = int(c1[1] + (c2[1] - c1[1]) * frac)
+        b = int(c1[2] + (c2[2] - c1[2]) * frac)
+        rings.append((r, g, b, 255 - int(i * alpha_step)))
+    return tuple(rings)
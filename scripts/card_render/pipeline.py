@@ -0,0 +1,221 @@
+"""
+Overlap compositing with encoding and writes inside one process.
+
+run_batch() composites, encodes and writes each card in turn, so the
+compositing thread sits idle while zlib / libwebp compress a card and
+while the file is written, although both release the GIL. run_pipeline()
+splits a batch into stages connected by bounded queues:
+
+  parse      reads records (manifest / database), checks the output cache
+  composite  ``compose(record)`` -> card, on the calling thread
+  encode     resizes and encodes every size, on ``encoders`` threads
+  write      writes the files and updates the output cache
+
+Each queue holds at most ``depth`` cards, so memory stays bounded when one
+stage falls behind. Every stage records its busy time and the depth of
+the queue feeding it; report() turns that into per-stage utilisation
+(busy time over wall time, per thread) and mean / max queue depth, which
+shows which stage is the bottleneck.
+
+run_parallel() uses this when it renders in-process (one worker).
+"""
+import os
+import queue
+import threading
+import time
+
+from .batch import BatchStats, finish, pending
+from .quality import render_quality
+from .sizes import encode_sizes
+
+_DONE = object()
+
+
+class Stage:
+    """Busy time and input queue depth of one pipeline stage."""
+
+    def __init__(self, name, threads=1):
+        self.name = name
+        self.threads = threads
+        self.items = 0
+        self.busy = 0.0
+        self.depth_total = 0
+        self.depth_max = 0
+        self._lock = threading.Lock()
+
+    def took(self, depth):
+        with self._lock:
+            self.depth_total += depth
+            self.depth_max = max(self.depth_max, depth)
+
+    def done(self, seconds):
+        with self._lock:
+            self.items += 1
+            self.busy += seconds
+
+    def summary(self, elapsed):
+        return {
+            'items': self.items,
+            'threads': self.threads,
+            'busy_s': round(self.busy, 3),
+            'utilisation': round(self.busy / (elapsed * self.threads), 3) if elapsed and self.threads else 0.0,
+            'queue_mean': round(self.depth_total / self.items, 2) if self.items else 0.0,
+            'queue_max': self.depth_max,
+        }
+
+
+def report(stages, elapsed):
+    """{stage name: summary} for a finished pipeline."""
+    return {stage.name: stage.summary(elapsed) for stage in stages}
+
+
+def format_report(stages):
+    """One line per stage of a report() dict."""
+    return [f"  {name:<9} x{s['threads']}  util {s['utilisation'] * 100:5.1f}%  "
+            f"queue mean {s['queue_mean']:.1f} max {s['queue_max']}  ({s['items']} items, {s['busy_s']:.2f}s busy)"
+            for name, s in stages.items()]
+
+
+def _put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stage, stop):
+    stage.took(q.qsize())
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _write(paths):
+    for path, data in paths:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def run_pipeline(records, compose, output_dir, cache=None, encoding=None, sizes=None, quality='final',
+                 encoders=2, depth=8, saved=None, preload=None):
+    """Render every record through the staged pipeline; returns BatchStats.
+
+    ``compose(record)`` returns the card; it runs on the calling thread.
+    ``saved(record, paths)`` is called after a card's files are written;
+    ``preload`` is passed to batch.pending().
+    ``stats.stages`` holds the per-stage report(). A card that fails in
+    any stage is counted as failed; if a stage thread itself dies, the
+    pipeline stops and its exception is raised here.
+    """
+    if encoders < 1:
+        raise ValueError(f'encoders must be at least 1, got {encoders}')
+    os.makedirs(output_dir, exist_ok=True)
+    stats = BatchStats()
+    stages = [Stage('parse'), Stage('composite'), Stage('encode', encoders), Stage('write')]
+    parse, composite, encode, write = stages
+    parsed, to_encode, to_write = (queue.Queue(depth) for _ in range(3))
+    stop = threading.Event()
+    failure = []
+
+    def guarded(target):
+        def run():
+            try:
+                target()
+            except BaseException as e:
+                failure.append(e)
+                stop.set()
+        return run
+
+    def read():
+        try:
+            items = iter(pending(records, output_dir, stats, cache, encoding, sizes, preload))
+            while True:
+                started = time.perf_counter()
+                item = next(items, _DONE)
+                if item is _DONE:
+                    break
+                parse.done(time.perf_counter() - started)
+                if not _put(parsed, item, stop):
+                    return
+        finally:
+            _put(parsed, _DONE, stop)
+
+    def encode_loop():
+        while True:
+            item = _get(to_encode, encode, stop)
+            if item is _DONE:
+                _put(to_write, _DONE, stop)
+                return
+            record, out, outs, key, card, error = item
+            started = time.perf_counter()
+            paths = None
+            if error is None:
+                try:
+                    with render_quality(quality):
+                        paths = encode_sizes(card, out, sizes, encoding)
+                except Exception as e:
+                    error = str(e)
+            encode.done(time.perf_counter() - started)
+            if not _put(to_write, (record, outs, key, paths, error), stop):
+                return
+
+    def write_loop():
+        remaining = encoders
+        while remaining:
+            item = _get(to_write, write, stop)
+            if item is _DONE:
+                remaining -= 1
+                continue
+            record, outs, key, paths, error = item
+            started = time.perf_counter()
+            try:
+                if error is None:
+                    _write(paths)
+                    if saved is not None:
+                        saved(record, [path for path, _ in paths])
+            except Exception as e:
+                error = str(e)
+            finish(stats, record, outs, key, error, cache)
+            write.done(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=guarded(read), name='pipeline-parse', daemon=True)]
+    threads += [threading.Thread(target=guarded(encode_loop), name=f'pipeline-encode-{i}', daemon=True)
+                for i in range(encoders)]
+    threads.append(threading.Thread(target=guarded(write_loop), name='pipeline-write', daemon=True))
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = _get(parsed, composite, stop)
+            if item is _DONE:
+                break
+            record, out, outs, key = item
+            started = time.perf_counter()
+            card, error = None, None
+            try:
+                card = compose(record)
+            except Exception as e:
+                error = str(e)
+            composite.done(time.perf_counter() - started)
+            if not _put(to_encode, (record, out, outs, key, card, error), stop):
+                break
+        for _ in range(encoders):
+            _put(to_encode, _DONE, stop)
+        for thread in threads:
+            thread.join()
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        if cache is not None:
+            cache.save()
+    if failure:
+        raise failure[0]
+    stats.stages = report(stages, stats.elapsed)
+    return stats
@@ -0,0 +1,187 @@
+"""
+Compiled plates: raw pixel buffers on disk, memory-mapped at startup.
+
+Building a plate decodes the WebP/PNG assets, resizes and enhances them,
+cuts out the robot and fades the border, and every worker process used
+to do all of that for itself and hold a private copy of the result.
+``python3 scripts/card-assets.py compile`` builds every plate once and
+writes each one here as uncompressed pixels. get_plate() (card_render.
+assets) then opens a compiled plate with ``mmap`` and wraps the mapping
+with ``Image.frombuffer``: no decoding at startup, and every process on
+the machine reads the same page-cached copy.
+
+A file holds one plate value: a JSON header describing its structure
+(the image, or the ``(image, state)`` pair) in which each image is a
+``{"image": [mode, size]}`` placeholder, followed by the images' raw
+bytes, 64-byte aligned. Tuples and dicts are tagged so they load back as
+the same types. The header is plain data, never unpickled: a file
+planted in the cache directory can't run code in the renderers. Files are named after
+the plate and a hash of its cache key (asset hashes, layout fingerprint)
+plus the Pillow and rembg versions, so a stale file is never picked up;
+compiling a plate again removes its older files.
+
+Mapped images are read-only; plates are already treated that way (and
+Pillow copies a read-only image before drawing on it).
+"""
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+
+import PIL
+from PIL import Image
+
+from .sprites import CACHE_DIR, REMBG_MODEL, rembg_version
+
+PLATE_DIR = os.environ.get('HELIXA_PLATE_DIR') or os.path.join(CACHE_DIR, 'plates')
+MAGIC = b'HXPLATE2'
+ALIGN = 64
+# Modes Pillow can wrap around a buffer without copying
+MAPPABLE = {'RGBA': 4, 'RGBX': 4, 'L': 1}
+
+_compiling = None
+
+
+class _Unstorable(Exception):
+    pass
+
+
+def _aligned(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def plate_file(key, store_dir=None):
+    """Path of the compiled file for a get_plate() key."""
+    env = [key, PIL.__version__, rembg_version(), REMBG_MODEL]
+    digest = hashlib.sha256(json.dumps(env, default=str).encode()).hexdigest()[:20]
+    return os.path.join(store_dir or PLATE_DIR, f'{key[0]}-{digest}.plate')
+
+
+def _encode(value, images):
+    """JSON-able form of a plate value; images are appended to ``images``."""
+    if isinstance(value, Image.Image):
+        if value.mode not in MAPPABLE:
+            raise _Unstorable(value.mode)
+        images.append(value)
+        return {'image': [value.mode, list(value.size)]}
+    if isinstance(value, tuple):
+        return {'tuple': [_encode(v, images) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v, images) for v in value]
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise _Unstorable('non-string dict key')
+        return {'dict': {k: _encode(v, images) for k, v in value.items()}}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise _Unstorable(type(value).__name__)
+
+
+def save(key, plate, store_dir=None):
+    """Write ``plate`` for ``key``; returns the path, or None if it holds no storable image."""
+    images = []
+    try:
+        header = json.dumps(_encode(plate, images)).encode()
+    except _Unstorable:
+        return None
+    if not images:
+        return None
+    path = plate_file(key, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        header = MAGIC + struct.pack('<Q', len(header)) + header
+        f.write(header + b'\0' * (_aligned(len(header)) - len(header)))
+        for img in images:
+            raw = img.tobytes()
+            f.write(raw + b'\0' * (_aligned(len(raw)) - len(raw)))
+    os.replace(tmp, path)
+    # Only '<name>-<digest>.plate'; a bare glob would also catch names that extend key[0]
+    own = re.compile(re.escape(key[0]) + r'-[0-9a-f]{20}\.plate')
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f'{glob.escape(key[0])}-*.plate')):
+        if stale != path and own.fullmatch(os.path.basename(stale)):
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass  # already removed by another worker
+    return path
+
+
+class _Decoder:
+    def __init__(self, view, offset):
+        self.view = view
+        self.offset = offset
+
+    def image(self, mode, size):
+        size = tuple(size)
+        n = size[0] * size[1] * MAPPABLE[mode]
+        data = self.view[self.offset:self.offset + n]
+        if len(data) != n:
+            raise ValueError('truncated plate file')
+        self.offset = _aligned(self.offset + n)
+        return Image.frombuffer(mode, size, data, 'raw', mode, 0, 1)
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        (tag, inner), = value.items()
+        if tag == 'image':
+            return self.image(*inner)
+        if tag == 'tuple':
+            return tuple(self.decode(v) for v in inner)
+        if tag == 'dict':
+            return {k: self.decode(v) for k, v in inner.items()}
+        raise ValueError(f'unknown plate value {tag!r}')
+
+
+def load(key, store_dir=None):
+    """The compiled plate for ``key``, memory-mapped, or None if there isn't a usable one."""
+    try:
+        with open(plate_file(key, store_dir), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        if mapped[:len(MAGIC)] != MAGIC:
+            return None
+        (length,) = struct.unpack_from('<Q', mapped, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(mapped[start:start + length])
+        return _Decoder(memoryview(mapped), _aligned(start + length)).decode(header)
+    except (ValueError, KeyError, TypeError, struct.error):
+        return None
+
+
+@contextmanager
+def compiling(store_dir=None):
+    """Inside the block, plates built by get_plate() are also written to the store.
+
+    Yields the list of files written.
+    """
+    global _compiling
+    written = []
+    previous, _compiling = _compiling, (store_dir, written)
+    try:
+        yield written
+    finally:
+        _compiling = previous
+
+
+def fetch(key, build):
+    """The plate for ``key``: compiled if available, else ``build()`` (stored while compiling)."""
+    if _compiling is not None:
+        store_dir, written = _compiling
+        plate = build()
+        path = save(key, plate, store_dir)
+        if path:
+            written.append(path)
+        return plate
+    plate = load(key)
+    return build() if plate is None else plate
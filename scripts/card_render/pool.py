@@ -0,0 +1,117 @@
+"""
+Multi-core batch rendering.
+
+Card rendering is CPU-bound Pillow work, so run_parallel() fans manifest
+records out to a process pool. Each worker warms the static plates once
+in its initializer; on platforms with fork the parent warms them first so
+workers inherit one copy-on-write set. Workers save their own output, and
+at most ``max_in_flight`` records are queued at any time, so memory stays
+flat no matter how long the manifest is. With one worker and a
+``compose`` callable, the batch runs in-process through the staged
+pipeline instead (card_render.pipeline).
+"""
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .batch import BatchStats, finish, pending, run_batch
+from .pipeline import run_pipeline
+
+_render_one = None
+
+
+def default_workers():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def positive_int(value):
+    """argparse type for worker / thread counts."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {number}')
+    return number
+
+
+def _init_worker(render_one, warm):
+    global _render_one
+    _render_one = render_one
+    if warm is not None:
+        warm()
+
+
+def _render_task(record, out):
+    try:
+        _render_one(record, out)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def _mp_context():
+    # fork shares plates warmed in the parent; elsewhere each worker warms its own
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _start_workers(pool):
+    """Fork every worker of ``pool`` now, before this process starts any threads."""
+    # With fork, the first submit launches all workers at once
+    pool.submit(os.getpid).result()
+
+
+def run_parallel(records, render_one, output_dir, workers=None, warm=None, max_in_flight=None, cache=None,
+                 encoding=None, sizes=None, compose=None, quality='final', saved=None, encoders=2,
+                 preload=None):
+    """Render records across ``workers`` processes; returns BatchStats.
+
+    ``render_one(record, out_path)`` and ``warm()`` must be importable
+    module-level functions (or partials of them) so they can be sent to
+    worker processes. ``encoding`` and ``sizes`` pick the output paths.
+    With one worker, ``compose(record)`` (returning the card) selects
+    run_pipeline(), which encodes ``encoding`` / ``sizes`` at ``quality``
+    on ``encoders`` threads and calls ``saved(record, paths)``.
+    ``preload`` runs in this process over the records that still need
+    rendering (see batch.pending()); workers are started before it, so
+    no preload thread is running when they fork.
+    """
+    workers = workers or default_workers()
+    if workers <= 1:
+        if warm is not None:
+            warm()
+        if compose is not None:
+            return run_pipeline(records, compose, output_dir, cache, encoding, sizes, quality,
+                                encoders=encoders, saved=saved, preload=preload)
+        return run_batch(records, render_one, output_dir, cache, encoding, sizes, preload)
+
+    os.makedirs(output_dir, exist_ok=True)
+    ctx = _mp_context()
+    if warm is not None and ctx.get_start_method() == 'fork':
+        warm()
+    max_in_flight = max_in_flight or workers * 4
+    stats = BatchStats()
+    in_flight = {}
+
+    def collect(done):
+        for fut in done:
+            finish(stats, *in_flight.pop(fut), fut.result(), cache)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(render_one, warm)) as pool:
+            _start_workers(pool)
+            for record, out, outs, key in pending(records, output_dir, stats, cache, encoding, sizes, preload):
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight[pool.submit(_render_task, record, out)] = (record, outs, key)
+            done, _ = wait(in_flight)
+            collect(done)
+    finally:
+        if cache is not None:
+            cache.save()
+    return stats
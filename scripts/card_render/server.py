@@ -0,0 +1,203 @@
+"""
+Resident card render service.
+
+Keeps a pool of worker processes with warm plates, fonts and glow caches,
+and serves renders over local HTTP so callers don't pay interpreter start,
+Pillow import, rembg and asset decoding per card.
+
+  POST /render[?format=F&quality=Q&compress_level=C&size=S&render_quality=R]
+                                   agent JSON in, image bytes out
+                                   (F: png, webp, webp-lossless, jpeg;
+                                   S: full, a width like 300, or 96x96;
+                                   R: final, or draft for live previews)
+  GET  /stats                      request count, errors, latency percentiles
+  GET  /healthz                    liveness
+
+The agent JSON is an object with the manifest fields (see
+card_render.manifest). The tier comes from cred unless ``tier`` is given.
+``aura`` is the file name of an image in the assets directory; other
+paths are rejected, so clients can't make the server open arbitrary files.
+
+Each worker remembers the cards it rendered last (card_render.incremental),
+so re-rendering an agent after a stat or badge change redraws only the
+layers that changed when the request lands on a worker that drew it
+before; otherwise the card is composed from scratch as usual.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .assets import ASSETS, asset_path
+from .encode import Encoding
+from .incremental import LayerCache
+from .loader import load_script
+from .manifest import normalize
+from .pool import _mp_context, _start_workers, default_workers
+from .quality import QUALITIES, render_quality
+from .sizes import encode_size, parse_sizes
+from .specs import TIER_SPECS
+from .stats import percentile
+from .trace import record_attrs, span
+
+MAX_BODY = 256 * 1024
+
+_tiers = None
+_cards = None
+
+
+def _init_worker():
+    global _tiers, _cards
+    _tiers = load_script('render-card-tiers')
+    _tiers.warm_plates()
+    _cards = LayerCache()
+
+
+def _render(record, encoding, size=None, quality='final'):
+    with render_quality(quality), span('render', attrs=lambda: record_attrs(record)):
+        card = _cards.compose(TIER_SPECS[record['tier']], record)
+        return encode_size(card, size, encoding)
+
+
+def _request_aura(record):
+    """``record`` with its aura resolved inside the assets directory (ValueError if it isn't there)."""
+    name = record['aura']
+    if name is None:
+        return record
+    path = os.path.realpath(asset_path(name))
+    if os.path.dirname(path) != os.path.realpath(ASSETS) or not os.path.isfile(path):
+        raise ValueError('aura must be the name of an image in the assets directory')
+    return dict(record, aura=path)
+
+
+def _query_encoding(query):
+    params = parse_qs(query)
+
+    def number(name):
+        value = params.get(name, [None])[0]
+        return int(value) if value not in (None, '') else None
+
+    return Encoding(params.get('format', ['png'])[0], number('quality'), number('compress_level'))
+
+
+def _query_size(query):
+    """The single ``size`` of a request; parse_sizes() rejects sizes above the full card."""
+    spec = parse_qs(query).get('size', ['full'])[0]
+    sizes = parse_sizes(spec)
+    if len(sizes) != 1:
+        raise ValueError('size takes a single size')
+    return sizes[0]
+
+
+class LatencyStats:
+    """Rolling window of successful render latencies (ms); failures only count as errors."""
+
+    def __init__(self, window=10000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, ms, ok=True):
+        with self._lock:
+            if ok:
+                self.samples.append(ms)
+            self.count += 1
+            self.errors += not ok
+
+    def snapshot(self):
+        with self._lock:
+            values = sorted(self.samples)
+            count, errors = self.count, self.errors
+        latency = {f'p{p}': percentile(values, p) for p in (50, 90, 95, 99)}
+        latency['max'] = values[-1] if values else None
+        return {
+            'requests': count,
+            'errors': errors,
+            'uptime_s': round(time.time() - self.started, 1),
+            'latency_ms': {k: round(v, 2) if v is not None else None for k, v in latency.items()},
+        }
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'HelixaCardRender/1'
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, obj):
+        self._send(status, json.dumps(obj).encode())
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/healthz':
+            self._json(200, {'ok': True})
+        elif path == '/stats':
+            self._json(200, self.server.stats.snapshot())
+        else:
+            self._json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/render':
+            self._json(404, {'error': 'not found'})
+            return
+        started = time.perf_counter()
+        try:
+            encoding = _query_encoding(url.query)
+            size = _query_size(url.query)
+            quality = parse_qs(url.query).get('render_quality', ['final'])[0]
+            if quality not in QUALITIES:
+                raise ValueError(f'render_quality must be one of {", ".join(QUALITIES)}')
+            length = int(self.headers.get('Content-Length') or 0)
+            if not 0 < length <= MAX_BODY:
+                raise ValueError('body must be 1 byte to 256 KiB of agent JSON')
+            record = _request_aura(normalize(json.loads(self.rfile.read(length))))
+        except (ValueError, TypeError, OverflowError) as e:
+            self.server.stats.record((time.perf_counter() - started) * 1000, ok=False)
+            self._json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.server.stats.record((time.perf_counter() - started) * 1000, ok=False)
+            self._json(500, {'error': str(e)})
+            return
+        try:
+            body = self.server.pool.submit(_render, record, encoding, size, quality).result()
+        except Exception as e:
+            self.server.stats.record((time.perf_counter() - started) * 1000, ok=False)
+            self._json(500, {'error': str(e)})
+            return
+        ms = (time.perf_counter() - started) * 1000
+        self.server.stats.record(ms)
+        self._send(200, body, encoding.mime_type, {'X-Card-Tier': record['tier'], 'X-Render-Ms': f'{ms:.1f}'})
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, quiet=False):
+        super().__init__(address, RenderHandler)
+        self.quiet = quiet
+        self.stats = LatencyStats()
+        self.pool = ProcessPoolExecutor(max_workers=workers or default_workers(),
+                                        mp_context=_mp_context(), initializer=_init_worker)
+        _start_workers(self.pool)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
@@ -0,0 +1,126 @@
+"""
+Emit several resolutions of one composited card.
+
+A size is ``None`` (the full card), a width in pixels (height follows the
+card's aspect ratio) or an explicit ``(width, height)``. On the command
+line: ``--sizes full,300,96`` or ``--sizes full,300x420``. Sizes never
+exceed the full card: parse_sizes() rejects them and target_dims() clamps.
+
+Every size comes from the in-memory card of the same render: sizes are
+produced largest first, and each one is resampled from the smallest
+already-produced image that is still at least REDUCING_GAP times larger,
+via Pillow's reduce-then-LANCZOS path (BILINEAR for drafts). A 96px avatar is therefore cut
+from the 300px preview, not from the 600px card.
+
+Extra sizes are written next to the main output as ``<name>@<size>.<ext>``.
+"""
+import os
+
+from PIL import Image
+
+from .encode import encode, save
+from .quality import resample
+from .specs import CARD_SIZE
+from .trace import traced
+
+REDUCING_GAP = 2.0
+
+
+def parse_sizes(spec):
+    """'full,300,96x96' -> [None, 300, (96, 96)]"""
+    sizes = []
+    for part in spec.split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if part == 'full':
+            size = None
+        elif 'x' in part:
+            w, h = part.split('x', 1)
+            size = (int(w), int(h))
+        else:
+            size = int(part)
+        dims = size if isinstance(size, tuple) else (size,)
+        if size is not None and min(dims) <= 0:
+            raise ValueError(f'size must be positive: {part!r}')
+        if size is not None and any(d > limit for d, limit in zip(dims, CARD_SIZE)):
+            raise ValueError(f'size larger than the full card ({CARD_SIZE[0]}x{CARD_SIZE[1]}): {part!r}')
+        if size not in sizes:
+            sizes.append(size)
+    if not sizes:
+        raise ValueError('no sizes given')
+    return sizes
+
+
+def size_label(size):
+    if size is None:
+        return ''
+    if isinstance(size, tuple):
+        return f'@{size[0]}x{size[1]}'
+    return f'@{size}'
+
+
+def sized_path(path, size):
+    root, ext = os.path.splitext(path)
+    return f'{root}{size_label(size)}{ext}'
+
+
+def target_dims(card_size, size):
+    if size is None:
+        return card_size
+    w, h = card_size
+    if isinstance(size, tuple):
+        return min(size[0], w), min(size[1], h)
+    size = min(size, w)
+    return size, max(1, round(h * size / w))
+
+
+@traced('resize')
+def resample_chain(card, sizes):
+    """{size: image} for every requested size, each derived from the cheapest larger image."""
+    full = card.size
+    produced = [card]
+    out = {}
+    dims_of = {size: target_dims(full, size) for size in sizes}
+    for size in sorted(sizes, key=lambda s: dims_of[s][0] * dims_of[s][1], reverse=True):
+        dims = dims_of[size]
+        if dims == full:
+            out[size] = card
+            continue
+        source = card
+        for img in produced:
+            if img.width >= dims[0] * REDUCING_GAP and img.height >= dims[1] * REDUCING_GAP:
+                source = img
+        resized = source.resize(dims, resample(Image.LANCZOS), reducing_gap=REDUCING_GAP)
+        produced.append(resized)
+        out[size] = resized
+    return out
+
+
+def save_sizes(card, out_path, sizes=None, encoding=None):
+    """Save ``card`` at every size; returns the paths written."""
+    if not sizes or sizes == [None]:
+        save(card, out_path, encoding)
+        return [out_path]
+    images = resample_chain(card, sizes)
+    paths = []
+    for size in sizes:
+        path = sized_path(out_path, size)
+        save(images[size], path, encoding)
+        paths.append(path)
+    return paths
+
+
+def encode_sizes(card, out_path, sizes=None, encoding=None):
+    """[(path, bytes)] for ``card`` at every size, as save_sizes() would write them."""
+    if not sizes or sizes == [None]:
+        return [(out_path, encode(card, encoding))]
+    images = resample_chain(card, sizes)
+    return [(sized_path(out_path, size), encode(images[size], encoding)) for size in sizes]
+
+
+def encode_size(card, size=None, encoding=None):
+    """Encode ``card`` at one size to bytes."""
+    if size is not None:
+        card = resample_chain(card, [size])[size]
+    return encode(card, encoding)
@@ -0,0 +1,203 @@
+"""
+Layout specs for every card design, drawn by card_render.layout.
+
+Each spec is plain data: the static plate steps, the agent layers and
+the overlay, as ``(kind, params)`` pairs in drawing order. Positions are
+card pixels, fonts are ``(face, size)`` from card_render.fonts and glows
+are ``(fill, radius, passes)``. See card_render.layout for what each
+step kind draws.
+
+BASIC, HOLO and FULLART are the three tiers of render-card-tiers.py.
+FULLART_V6 is the locked v6 composition of render-fullart.py; it keeps
+its own robot scale, margins and bar style, so both scripts' output is
+unchanged, but the differences are now side by side here rather than in
+two copies of the drawing code.
+
+Bios are word-wrapped to ``width`` px by card_render.text; past
+``max_lines`` the last line ends in an ellipsis.
+"""
+from PIL import Image
+
+from .overlays import fade_rings, palette_rings
+
+CARD_SIZE = (600, 840)
+
+# Colors
+CYAN = (110, 236, 216)
+LAVENDER = (180, 144, 255)
+PINK = (245, 160, 208)
+BLUE = (128, 208, 255)
+WHITE = (255, 255, 255)
+LIGHT = (220, 220, 230)
+DIM = (180, 180, 200)
+SILVER = (140, 140, 160)
+HOLO_PALETTE = (CYAN, LAVENDER, PINK, BLUE, CYAN)
+
+
+def _glow(color, radius, passes, alpha=200):
+    """Tier glow: ``color`` at ``alpha``."""
+    return (*color, alpha), radius, passes
+
+
+# --- render-card-tiers.py -----------------------------------------------------
+
+HELIX = ('background', {'asset': 'helix-bg.webp', 'resample': Image.LANCZOS,
+                        'enhance': (('color', 1.2), ('brightness', 0.8))})
+TIER_ROBOT = ('robot', {'asset': 'robot-fullbody-front.webp', 'scale': 1.2, 'top_div': 5})
+TIER_AURA = ('aura', {'asset': 'aura-bendr.png', 'sizes': (130,), 'resample': Image.NEAREST,
+                      'center': (306, 199)})
+TIER_GRADIENT = ('gradient', {'color': (10, 10, 20), 'start': 520})
+
+TIER_BARS = {
+    'font': ('bold', 12), 'label_color': LIGHT, 'glow': (6, 2), 'glow_alpha': 200, 'blend': 'paste',
+    'bar': (65, 4, 200, 10, 5), 'track': (40, 40, 60), 'clamp': True, 'min_fill': 0, 'fill_glow': None,
+    'value_dx': 8, 'value_color': WHITE,
+}
+TIER_BADGES = {
+    'font': ('bold', 11), 'pad': (8, 3), 'radius': 8, 'gap': 6, 'text_dy': -1,
+    'glow': (5, 2), 'glow_alpha': 200, 'glow_pill': False, 'blend': 'paste', 'only': None,
+}
+TIER_TRAITS = {
+    'font': ('bold', 11), 'pad': (7, 2), 'height': None, 'radius': 6, 'gap': 5, 'text_dy': -1,
+    'color': CYAN, 'text_color': CYAN, 'glow': None, 'pill_over_text': False,
+}
+TIER_FOOTER = 'HELIXA  ·  ERC-8004  ·  BASE'
+TIER_TEXT_WIDTH = CARD_SIZE[0] - 48
+
+BASIC_Y = 520
+BASIC = {
+    'name': 'basic',
+    'tier': 'basic',
+    'size': CARD_SIZE,
+    'plate': (
+        ('background', dict(HELIX[1], enhance=HELIX[1]['enhance'] + (('brightness', 0.3),))),
+        ('aura', dict(TIER_AURA[1], sizes=(130, 200), center=(300, 260))),
+        TIER_GRADIENT,
+        ('rings', {'colors': fade_rings(SILVER, (80, 80, 100), 6)}),
+    ),
+    'layers': (
+        ('text', {'field': 'name', 'xy': (24, BASIC_Y), 'font': ('bold', 24), 'color': WHITE,
+                  'glow': _glow(SILVER, 8, 2), 'blend': 'paste'}),
+        ('text', {'field': 'framework', 'xy': (576, BASIC_Y + 6), 'align': 'right', 'advance': 9,
+                  'font': ('bold', 14), 'color': LIGHT, 'glow': _glow(SILVER, 6, 2), 'blend': 'paste'}),
+        ('stats', dict(TIER_BARS, xy=(24, BASIC_Y + 50), spacing=22, rows=(('CRED', 'cred', SILVER),))),
+        ('bio', {'xy': (24, BASIC_Y + 90), 'font': ('regular', 11), 'color': DIM, 'width': TIER_TEXT_WIDTH,
+                 'max_lines': 1}),
+        ('text', {'text': TIER_FOOTER, 'xy': (24, 810), 'font': ('regular', 9), 'color': (80, 80, 100)}),
+        ('text', {'text': 'BASIC', 'xy': (520, 810), 'font': ('bold', 10), 'color': SILVER}),
+    ),
+    'overlay': (),
+}
+
+HOLO_Y = 540
+HOLO = {
+    'name': 'holo',
+    'tier': 'holo',
+    'size': CARD_SIZE,
+    'plate': (
+        HELIX,
+        TIER_ROBOT,
+        TIER_AURA,
+        TIER_GRADIENT,
+        ('rings', {'colors': palette_rings(HOLO_PALETTE, 10)}),
+    ),
+    'layers': (
+        ('text', {'field': 'name', 'xy': (24, HOLO_Y), 'font': ('bold', 24), 'color': WHITE,
+                  'glow': _glow(LAVENDER, 8, 3), 'blend': 'paste'}),
+        ('text', {'field': 'framework', 'xy': (576, HOLO_Y + 6), 'align': 'right', 'advance': 9,
+                  'font': ('bold', 14), 'color': (240, 240, 255), 'glow': _glow(LAVENDER, 8, 2), 'blend': 'paste'}),
+        ('badges', dict(TIER_BADGES, xy=(24, HOLO_Y + 35), colors={'VERIFIED': CYAN}, default=LAVENDER)),
+        ('stats', dict(TIER_BARS, xy=(24, HOLO_Y + 62), spacing=22,
+                       rows=(('RISK', 'risk', PINK), ('AUTO', 'auto', CYAN), ('CRED', 'cred', BLUE)))),
+        ('traits', dict(TIER_TRAITS, xy=(24, HOLO_Y + 140), limit=4)),
+        ('bio', {'xy': (24, HOLO_Y + 170), 'font': ('regular', 11), 'color': DIM, 'width': TIER_TEXT_WIDTH,
+                 'max_lines': 1}),
+        ('text', {'text': TIER_FOOTER, 'xy': (24, 810), 'font': ('regular', 9), 'color': (100, 100, 130)}),
+        ('text', {'text': 'HOLO', 'xy': (530, 810), 'font': ('bold', 10), 'color': LAVENDER}),
+    ),
+    'overlay': (),
+}
+
+FULLART_Y = 570
+FULLART = {
+    'name': 'fullart',
+    'tier': 'fullart',
+    'size': CARD_SIZE,
+    'plate': (
+        HELIX,
+        TIER_ROBOT,
+        TIER_AURA,
+        TIER_GRADIENT,
+        ('border', {'asset': 'border-fullart.webp', 'resample': Image.LANCZOS, 'falloff': 'tiers',
+                    'fallback': palette_rings(HOLO_PALETTE, 16)}),
+    ),
+    'layers': (
+        ('text', {'field': 'name', 'xy': (24, FULLART_Y), 'font': ('bold', 26), 'color': WHITE,
+                  'glow': _glow(CYAN, 10, 3), 'blend': 'paste'}),
+        ('text', {'field': 'framework', 'xy': (576, FULLART_Y + 6), 'align': 'right', 'advance': 10,
+                  'font': ('bold', 15), 'color': (240, 240, 255), 'glow': _glow(LAVENDER, 10, 3), 'blend': 'paste'}),
+        ('badges', dict(TIER_BADGES, xy=(24, FULLART_Y + 37), colors={'VERIFIED': CYAN, 'V1 OG': CYAN},
+                        default=LAVENDER)),
+        ('stats', dict(TIER_BARS, xy=(24, FULLART_Y + 66), spacing=24,
+                       rows=(('RISK', 'risk', PINK), ('AUTO', 'auto', CYAN), ('CRED', 'cred', BLUE)))),
+        ('traits', dict(TIER_TRAITS, xy=(24, FULLART_Y + 142), limit=5)),
+        ('bio', {'xy': (24, FULLART_Y + 172), 'font': ('regular', 11), 'color': DIM, 'width': TIER_TEXT_WIDTH,
+                 'max_lines': 2, 'line_height': 16, 'glow': _glow(LAVENDER, 4, 1), 'blend': 'paste'}),
+        ('text', {'text': TIER_FOOTER, 'xy': (24, 808), 'font': ('regular', 9), 'color': (100, 100, 130)}),
+        ('text', {'text': 'FULL ART', 'xy': (500, 808), 'font': ('bold', 10), 'color': CYAN}),
+    ),
+    'overlay': (),
+}
+
+TIER_SPECS = {'basic': BASIC, 'holo': HOLO, 'fullart': FULLART}
+
+
+# --- render-fullart.py (locked v6) --------------------------------------------
+
+V6_Y = 570
+V6_LEFT, V6_RIGHT = 55, 545  # inside the ornate border
+V6_BARS = {
+    'font': ('bold', 12), 'label_color': LIGHT, 'glow': (6, 2), 'glow_alpha': None, 'blend': 'over',
+    'bar': (55, 3, 260, 12, 3), 'track': (20, 20, 30, 120), 'clamp': False, 'min_fill': 4, 'fill_glow': (4, 1),
+    'value_dx': 10, 'value_color': None,
+}
+
+FULLART_V6 = {
+    'name': 'fullart-v6',
+    'tier': 'fullart',
+    'size': CARD_SIZE,
+    'plate': (
+        ('background', {'asset': 'helix-bg.webp', 'resample': Image.BICUBIC,
+                        'enhance': (('color', 1.2), ('brightness', 0.8))}),
+        ('robot', {'asset': 'robot-fullbody-front.webp', 'scale': 1.5, 'top_div': 10, 'screen': (462, 255)}),
+        # Aura fills the TV screen interior (~300px wide at 1.5x scale)
+        ('aura', {'asset': 'aura-bendr.png', 'sizes': (260,), 'resample': Image.LANCZOS, 'center': None,
+                  'backdrop': {'pad': 10, 'radius': 8, 'fill': (5, 5, 15, 220)}}),
+        ('gradient', {'color': (8, 8, 16), 'start': 520}),
+    ),
+    'layers': (
+        ('text', {'field': 'name', 'xy': (V6_LEFT, V6_Y), 'font': ('bold', 26), 'color': WHITE,
+                  'glow': (CYAN, 10, 3)}),
+        ('text', {'field': 'framework', 'upper': True, 'xy': (V6_RIGHT, V6_Y + 6), 'align': 'right',
+                  'font': ('bold', 15), 'color': (240, 240, 255), 'glow': (LAVENDER, 10, 3)}),
+        ('badges', {'xy': (V6_LEFT - 8, V6_Y + 34), 'font': ('bold', 12), 'pad': (8, 3), 'radius': 8, 'gap': 8,
+                    'text_dy': 0, 'glow': (6, 1), 'glow_alpha': None, 'glow_pill': True, 'blend': 'over',
+                    'only': ('SOULBOUND', 'VERIFIED'),
+                    'colors': {'SOULBOUND': (180, 136, 255), 'VERIFIED': (105, 240, 174)}, 'default': None}),
+        ('stats', dict(V6_BARS, xy=(V6_LEFT, V6_Y + 66), spacing=24,
+                       rows=(('RISK', 'risk', (255, 82, 82)), ('AUTO', 'auto', (64, 196, 255)),
+                             ('CRED', 'cred', (180, 136, 255))))),
+        ('traits', {'xy': (V6_LEFT, V6_Y + 140), 'limit': None, 'font': ('bold', 12), 'pad': (8, 0),
+                    'height': 18, 'radius': 10, 'gap': 8, 'text_dy': 2, 'color': (*CYAN, 100),
+                    'text_color': (180, 220, 230), 'glow': (CYAN, 4, 2), 'pill_over_text': True}),
+        ('bio', {'xy': (V6_LEFT, V6_Y + 172), 'font': ('regular', 11), 'color': DIM, 'width': CARD_SIZE[0] - 110,
+                 'max_lines': 3, 'line_height': 16, 'glow': ((120, 80, 180), 4, 1)}),
+        ('text', {'text': 'HELIXA · ERC-8004 · BASE', 'xy': (V6_LEFT, CARD_SIZE[1] - 38), 'font': ('regular', 10),
+                  'color': (80, 80, 100), 'glow': ((60, 60, 80), 3, 1)}),
+    ),
+    # Ornate border over the text; drafts flatten it into the plate instead
+    'overlay': (
+        ('border', {'asset': 'border-fullart.webp', 'resample': Image.BICUBIC, 'falloff': 'fullart',
+                    'fallback': None}),
+    ),
+}
@@ -0,0 +1,90 @@
+"""
+On-disk cache of rembg background-removed sprites.
+
+rembg loads an ONNX model and runs inference every time it is called, but
+the robot sprite never changes. Cut-outs are stored as lossless PNGs named
+after the source file hash, rembg model and rembg version, so a deploy can
+warm the cache once (``python3 scripts/card-assets.py warm``) and renders
+never import rembg again.
+"""
+import glob
+import os
+import threading
+from importlib import metadata
+
+from PIL import Image
+
+from .assets import file_digest
+
+CACHE_DIR = os.environ.get('HELIXA_RENDER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'helixa-cards'))
+REMBG_MODEL = os.environ.get('HELIXA_REMBG_MODEL', 'u2net')
+
+
+def rembg_version():
+    """Installed rembg version, read from package metadata (no import)."""
+    try:
+        return metadata.version('rembg')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _sprite_dir(cache_dir):
+    return os.path.join(cache_dir or CACHE_DIR, 'sprites')
+
+
+def sprite_path(src_path, model=REMBG_MODEL, version=None, cache_dir=None):
+    version = version or rembg_version() or 'none'
+    name = f'{file_digest(src_path)}-{model}-{version}.png'
+    return os.path.join(_sprite_dir(cache_dir), name)
+
+
+def _find_cached(src_path, model, cache_dir):
+    version = rembg_version()
+    if version:
+        path = sprite_path(src_path, model, version, cache_dir)
+        return path if os.path.exists(path) else None
+    # rembg not installed here: accept a cut-out made by any rembg version
+    matches = glob.glob(os.path.join(_sprite_dir(cache_dir), f'{file_digest(src_path)}-{model}-*.png'))
+    return max(matches, key=os.path.getmtime) if matches else None
+
+
+def _run_rembg(src_path, model):
+    from rembg import remove, new_session
+    img = Image.open(src_path).convert('RGBA')
+    return remove(img, session=new_session(model)).convert('RGBA')
+
+
+def cutout(src_path, model=REMBG_MODEL, cache_dir=None):
+    """Return the background-removed RGBA sprite for ``src_path``.
+
+    Served from the on-disk cache when possible; otherwise rembg runs once
+    and the result is stored. Raises ImportError if rembg is unavailable
+    and nothing is cached.
+    """
+    cached = _find_cached(src_path, model, cache_dir)
+    if cached:
+        with Image.open(cached) as img:
+            return img.convert('RGBA')
+    sprite = _run_rembg(src_path, model)
+    store(sprite, sprite_path(src_path, model, cache_dir=cache_dir))
+    return sprite
+
+
+def store(img, path):
+    """Write a PNG atomically so concurrent renders never read a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    img.save(tmp, 'PNG')
+    os.replace(tmp, path)
+
+
+def warm(src_paths, model=REMBG_MODEL, cache_dir=None, force=False):
+    """Pre-compute cut-outs for ``src_paths``. Returns [(src, sprite, built)]."""
+    results = []
+    for src in src_paths:
+        path = sprite_path(src, model, cache_dir=cache_dir)
+        built = force or not os.path.exists(path)
+        if built:
+            store(_run_rembg(src, model), path)
+        results.append((src, path, built))
+    return results
@@ -0,0 +1,12 @@
+"""
+Small statistics helpers shared by the render server and the benchmark.
+"""
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank ``pct`` percentile of already sorted values (None if empty)."""
+    if not sorted_values:
+        return None
+    k = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
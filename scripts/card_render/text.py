@@ -0,0 +1,120 @@
+"""
+Text layout shared by the card layers: cached measurement and word wrap.
+
+The v6 bio used to be wrapped by measuring ``line + " " + word`` with two
+``getbbox`` calls per word, re-laying out the whole growing line every
+time, and the tier cards cut the bio at a fixed character count, often
+mid-word. wrap() does both jobs:
+
+  - every word's advance and ink extent are measured once per font and
+    cached, and a line's ink width is tracked as words are added, so a
+    bio is wrapped in one pass over its words;
+  - lines break between words; a word wider than the line (a URL, or CJK
+    text with no spaces) is broken between characters, keeping combining
+    marks with their base;
+  - with ``max_lines``, the last line that fits ends in an ellipsis.
+
+Text is NFC-normalized first. A candidate line whose tracked width lands
+within MEASURE_SLACK px of the limit is measured whole with ``getbbox``,
+so rounding or kerning across the joining space can't move a line break:
+breaks match measuring every candidate line the slow way.
+"""
+import unicodedata
+from functools import lru_cache
+
+ELLIPSIS = '…'
+MEASURE_SLACK = 2
+
+
+def ink_width(text_font, text):
+    """Width of the ink of ``text`` in px."""
+    left, _, right, _ = text_font.getbbox(text)
+    return right - left
+
+
+@lru_cache(maxsize=16384)
+def _metrics(text_font, piece):
+    """(advance, ink left, ink right) of one word or character."""
+    left, _, right, _ = text_font.getbbox(piece)
+    return text_font.getlength(piece), left, right
+
+
+@lru_cache(maxsize=64)
+def _advance(text_font, text):
+    return text_font.getlength(text)
+
+
+def _fits(text_font, candidate, estimate, width):
+    if estimate < width - MEASURE_SLACK:
+        return True
+    if estimate >= width + MEASURE_SLACK:
+        return False
+    return ink_width(text_font, candidate()) < width
+
+
+def _runs(pieces, text_font, width, sep):
+    """Greedy split of ``pieces`` into runs whose ``sep``-joined ink is narrower than ``width``.
+
+    Yields each run (a list) as it closes; a piece that is too wide on its
+    own gets a run to itself.
+    """
+    gap = _advance(text_font, sep) if sep else 0
+    run = []
+    left = right = pen = 0
+    for piece in pieces:
+        advance, l, r = _metrics(text_font, piece)
+        if run:
+            start = pen + gap
+            lo, hi = min(left, start + l), max(right, start + r)
+            if _fits(text_font, lambda: sep.join(run + [piece]), hi - lo, width):
+                run.append(piece)
+                left, right, pen = lo, hi, start + advance
+                continue
+            yield run
+        run = [piece]
+        left, right, pen = l, r, advance
+    if run:
+        yield run
+
+
+def _clusters(word):
+    """Characters of ``word`` with combining marks kept on their base."""
+    clusters = []
+    for ch in word:
+        if clusters and unicodedata.combining(ch):
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return clusters
+
+
+def _ellipsize(line, text_font, width, ellipsis):
+    """``line`` shortened (by words, then characters) until it fits with ``ellipsis``."""
+    while line and ink_width(text_font, line + ellipsis) >= width:
+        cut = line.rfind(' ')
+        line = line[:cut] if cut > 0 else line[:-1]
+        while line and unicodedata.combining(line[-1]):
+            line = line[:-1]
+        line = line.rstrip()
+    return line + ellipsis
+
+
+def wrap(text, text_font, width, max_lines=None, ellipsis=ELLIPSIS):
+    """Lines of ``text`` whose ink is each narrower than ``width`` px.
+
+    With ``max_lines``, text past that many lines is dropped and the last
+    line ends in ``ellipsis``.
+    """
+    lines = []
+    for run in _runs(unicodedata.normalize('NFC', text or '').split(), text_font, width, ' '):
+        _, left, right = _metrics(text_font, run[0])
+        if len(run) == 1 and right - left >= width:
+            lines.extend(''.join(part) for part in _runs(_clusters(run[0]), text_font, width, ''))
+        else:
+            lines.append(' '.join(run))
+        if max_lines and len(lines) > max_lines:
+            break
+    if max_lines and len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = _ellipsize(lines[-1], text_font, width, ellipsis)
+    return lines
@@ -0,0 +1,264 @@
+"""
+Per-layer render timing and tracing.
+
+The renderers wrap each layer (background, robot, aura, text glow, stat
+bars, ...) in ``span('name')`` or decorate it with ``@traced('name')``.
+With nothing recording that is a ContextVar lookup and a global check;
+no timestamps are taken and no objects are built.
+
+Two recorders consume spans:
+
+  LayerTimes  ``with recording() as rec:`` adds every span's self time
+              (wall time minus spans nested in it) to ``rec.totals``, so a
+              card's layers sum to the time spent in traced code. Used by
+              the benchmark.
+  Tracer      emits one structured event per finished span to a sink:
+              stdout (JSON lines), a file (JSON lines) or any callable.
+              Render-level spans carry the agent attributes (id, tier,
+              bio length, trait count, custom aura); every span carries
+              the trace id of the card it belongs to.
+
+Production tracing is switched on with HELIXA_TRACE (``stdout``, ``-`` or
+a file path) or ``--trace`` on the render scripts; HELIXA_TRACE_MEMORY=1
+adds tracemalloc net/peak KiB per span (slow; Pillow pixel buffers are
+not Python allocations and don't show up there). Every event has
+``alloc_blocks``, the change in live Python allocator blocks.
+
+A span event looks like:
+
+  {"trace": 12, "span": "text_glow", "parent": "render_holo", "depth": 1,
+   "at_ms": 3.91, "ms": 0.84, "self_ms": 0.84, "alloc_blocks": 7}
+"""
+import contextvars
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+_recorder = contextvars.ContextVar('layer_recorder', default=None)
+_NULL = nullcontext()
+# Process-wide tracer (HELIXA_TRACE / configure()); used when no recorder is set
+_default = None
+
+
+def _active():
+    recorder = _recorder.get()
+    return recorder if recorder is not None else _default
+
+
+class LayerTimes:
+    """Self time (seconds) and call count per layer name."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._stack = []
+
+    def _enter(self, name, attrs):
+        self._stack.append(0.0)
+
+    def _exit(self, name, elapsed):
+        nested = self._stack.pop()
+        self.totals[name] += elapsed - nested
+        self.counts[name] += 1
+        if self._stack:
+            self._stack[-1] += elapsed
+
+    def merge(self, other):
+        for name, seconds in other.totals.items():
+            self.totals[name] += seconds
+            self.counts[name] += other.counts[name]
+
+
+class _Frame:
+    __slots__ = ('name', 'attrs', 'nested', 'blocks', 'memory', 'trace', 'started')
+
+
+class Tracer:
+    """Emit a structured event per finished span to ``sink(event)``."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, sink, memory=False):
+        self.sink = sink
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name, attrs):
+        stack = self._stack()
+        frame = _Frame()
+        frame.name = name
+        frame.attrs = attrs
+        frame.nested = 0.0
+        frame.trace = stack[0].trace if stack else next(self._ids)
+        frame.started = stack[0].started if stack else time.perf_counter()
+        if self.memory:
+            tracemalloc.reset_peak()
+            frame.memory = tracemalloc.get_traced_memory()[0]
+        frame.blocks = sys.getallocatedblocks()
+        stack.append(frame)
+
+    def _exit(self, name, elapsed):
+        blocks = sys.getallocatedblocks()
+        stack = self._stack()
+        frame = stack.pop()
+        event = {
+            'trace': frame.trace,
+            'span': name,
+            'parent': stack[-1].name if stack else None,
+            'depth': len(stack),
+            'at_ms': round((time.perf_counter() - elapsed - frame.started) * 1000, 3),
+            'ms': round(elapsed * 1000, 3),
+            'self_ms': round((elapsed - frame.nested) * 1000, 3),
+            'alloc_blocks': blocks - frame.blocks,
+        }
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            event['alloc_kb'] = round((current - frame.memory) / 1024, 1)
+            event['peak_kb'] = round((peak - frame.memory) / 1024, 1)
+        if frame.attrs:
+            event.update(frame.attrs)
+        if stack:
+            stack[-1].nested += elapsed
+        self.sink(event)
+
+
+def stdout_sink(event):
+    sys.stdout.write(json.dumps(event, default=str) + '\n')
+
+
+class FileSink:
+    """Append events as JSON lines; safe to share between threads and processes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', buffering=1, encoding='utf-8')
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def sink_for(spec):
+    """'stdout' / '-' -> stdout_sink, anything else -> FileSink(path)."""
+    if spec in ('stdout', '-'):
+        return stdout_sink
+    return FileSink(spec)
+
+
+def configure(spec=None, memory=None):
+    """Install (or with no spec, remove) the process-wide tracer.
+
+    Also exported through the environment so spawned workers trace too.
+    """
+    global _default
+    if memory is None:
+        memory = os.environ.get('HELIXA_TRACE_MEMORY', '') not in ('', '0')
+    if not spec:
+        _default = None
+        os.environ.pop('HELIXA_TRACE', None)
+        return None
+    os.environ['HELIXA_TRACE'] = spec
+    _default = Tracer(sink_for(spec), memory=memory)
+    return _default
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'attrs', 'started')
+
+    def __init__(self, recorder, name, attrs=None):
+        self.recorder = recorder
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.recorder._enter(self.name, self.attrs)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder._exit(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def span(name, attrs=None, **fields):
+    """Context manager timing one layer (a no-op unless recording or tracing).
+
+    ``fields`` are extra event fields; ``attrs()``, if given, returns more
+    of them and, like traced(attrs=...), only runs while tracing.
+    """
+    recorder = _active()
+    if recorder is None:
+        return _NULL
+    if attrs is not None and isinstance(recorder, Tracer):
+        fields = dict(fields, **attrs())
+    return _Span(recorder, name, fields)
+
+
+def traced(name, attrs=None):
+    """Decorator: time every call of the function as layer ``name``.
+
+    ``attrs(*args, **kwargs)``, if given, returns extra event fields for
+    the call (e.g. the agent id); it only runs while tracing.
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = _active()
+            if recorder is None:
+                return fn(*args, **kwargs)
+            extra = attrs(*args, **kwargs) if attrs is not None and isinstance(recorder, Tracer) else None
+            with _Span(recorder, name, extra):
+                return fn(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+@contextmanager
+def recording(recorder=None):
+    """Send spans inside the block to ``recorder`` (a new LayerTimes by default)."""
+    recorder = recorder if recorder is not None else LayerTimes()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def record_attrs(record, tier=None):
+    """Trace attributes for a manifest-style agent record."""
+    return {
+        'agent': record.get('id') or record.get('name'),
+        'tier': record.get('tier') or tier,
+        'bio_chars': len(record.get('bio') or ''),
+        'traits': len(record.get('traits') or ()),
+        'custom_aura': bool(record.get('aura')),
+    }
+
+
+if os.environ.get('HELIXA_TRACE'):
+    configure(os.environ['HELIXA_TRACE'])
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the card renderers on a fixed synthetic corpus.
+
+Usage: python3 render-bench.py [--per-tier N] [--seed S] [--renderer tiers|fullart|all]
+                               [--json out.json] [--baseline old.json] [--max-regression 0.10]
+
+Renders the same agents every run (all three tiers through render-card-tiers.py,
+and all of them as Full Art through render-fullart.py), encoding each card in
+memory. Prints cards/s, p50/p95 latency, peak RSS (process, and per card on
+Linux; see card_render.bench) and mean ms per card per layer,
+and how long a cred update takes with and without the incremental layer cache;
+--json writes the full result. With --baseline, exits 1 if any renderer's
+cards/s dropped by more than --max-regression.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from card_render import bench
+from card_render.encode import add_arguments as encode_args, from_args as encoding_from_args
+from card_render.loader import load_script
+from card_render.quality import QUALITIES, render_quality
+
+
+def print_result(result):
+    cold = result['cold_start']
+    print(f"Cold start (all plates): {cold['ms']:.0f} ms")
+    for layer, ms in cold['layers_ms'].items():
+        print(f'    {layer:<12} {ms:8.1f} ms')
+    for name, r in result['renderers'].items():
+        lat = r['latency_ms']
+        print(f"{name}: {r['cards']} cards, {r['cards_per_s']:.1f} cards/s, "
+              f"p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, peak RSS {r['peak_rss_mb']} MB")
+        if r.get('card_peak_mb'):
+            print(f"    per-card peak RSS p50 {r['card_peak_mb']['p50']:.2f} MB, max {r['card_peak_mb']['max']:.2f} MB")
+        for tier, t in r['by_tier'].items():
+            print(f"    {tier:<12} p50 {t['p50']:6.1f} ms  p95 {t['p95']:6.1f} ms")
+        for layer, ms in r['layers_ms'].items():
+            print(f'    {layer:<12} {ms:8.2f} ms/card')
+    for name, updates in result.get('updates', {}).items():
+        full, inc = updates['full_ms'], updates['incremental_ms']
+        print(f"{name} {updates['field']} update (compose only): full p50 {full['p50']:.1f} ms, "
+              f"incremental p50 {inc['p50']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Helixa card rendering')
+    parser.add_argument('--per-tier', type=int, default=20, help='synthetic agents per tier')
+    parser.add_argument('--seed', type=int, default=8004)
+    parser.add_argument('--renderer', choices=['tiers', 'fullart', 'all'], default='all')
+    parser.add_argument('--render-quality', choices=QUALITIES, default='final')
+    parser.add_argument('--json', default=None, help='write the result here')
+    parser.add_argument('--baseline', default=None, help='earlier --json result to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.10,
+                        help='allowed cards/s drop vs --baseline (0.10 = 10%%)')
+    encode_args(parser)
+    args = parser.parse_args()
+    encoding = encoding_from_args(args)
+
+    tiers = load_script('render-card-tiers')
+    fullart = load_script('render-fullart')
+    renderers = {
+        'tiers': lambda record: tiers.COMPOSERS[record['tier']](record),
+        'fullart': lambda record: fullart.compose_fullart(**fullart.record_kwargs(record)),
+    }
+    specs = {
+        'tiers': lambda record: tiers.TIER_SPECS[record['tier']],
+        'fullart': lambda record: fullart.FULLART_V6,
+    }
+    if args.renderer != 'all':
+        renderers = {args.renderer: renderers[args.renderer]}
+
+    corpus = bench.synthetic_corpus(args.per_tier, args.seed)
+    result = {
+        'config': {'per_tier': args.per_tier, 'seed': args.seed, 'encoding': encoding.tag,
+                   'render_quality': args.render_quality},
+        'environment': bench.environment(),
+    }
+    with render_quality(args.render_quality):
+        result['cold_start'] = bench.cold_start([tiers.warm_plates, fullart.warm_plates])
+        result['renderers'] = {name: bench.bench_renderer(corpus, compose, encoding)
+                               for name, compose in renderers.items()}
+        result['updates'] = {name: bench.bench_updates(corpus, specs[name]) for name in renderers}
+    print_result(result)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f'✅ Wrote {args.json}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('config') != result['config']:
+            print(f"WARNING: baseline config {baseline.get('config')} differs from this run's")
+        found = bench.regressions(result, baseline, args.max_regression)
+        for message in found:
+            print(f'❌ Regression: {message}')
+        if found:
+            sys.exit(1)
+        print(f'✅ No renderer regressed more than {args.max_regression:.0%} vs {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Long-running Helixa card render service (local HTTP).
+
+Usage: python3 render-server.py [--host 127.0.0.1] [--port 7420] [--workers N] [--trace stdout|FILE]
+
+  curl -s -X POST 'http://127.0.0.1:7420/render?format=webp' \
+       -d '{"name": "Bendr 2.0", "cred": 77, "badges": ["VERIFIED"]}' > card.webp
+  curl -s http://127.0.0.1:7420/stats
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from card_render.pool import default_workers, positive_int
+from card_render.server import RenderServer
+from card_render.trace import configure as configure_trace
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve Helixa card renders over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7420)
+    parser.add_argument('--workers', type=positive_int, default=default_workers())
+    parser.add_argument('--quiet', action='store_true', help='no per-request access log')
+    parser.add_argument('--trace', default=None, metavar='stdout|FILE',
+                        help='emit per-layer span timings as JSON lines (also HELIXA_TRACE)')
+    args = parser.parse_args()
+    if args.trace:
+        configure_trace(args.trace)
+
+    server = RenderServer((args.host, args.port), workers=args.workers, quiet=args.quiet)
+    print(f'✅ Card render server on http://{args.host}:{args.port} ({args.workers} workers)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()